@@ -171,13 +171,7 @@ class CmdPlugin(CmdHandlersMixin, PluginBase):
         await self._apply_saved_response_user_list(ConfigKeys.BOT_RESPONSE_BLACKLIST)
 
     def _set_global_config_value(self, path: str, value: Any) -> None:
-        keys = path.split(".")
-        config = self.global_config.data
-        for key in keys[:-1]:
-            if not isinstance(config.get(key), dict):
-                config[key] = {}
-            config = config[key]
-        config[keys[-1]] = value
+        self.global_config.set(path, value)
 
     def _is_authorized(self, user_id: str, handle: str | None) -> bool:
         return user_id in self.allowed_users or (
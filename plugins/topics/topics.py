@@ -109,12 +109,14 @@ class TopicsPlugin(PluginBase):
 
     async def _initialize_rss_data(self) -> None:
         try:
+            defaults: list[tuple[str, str]] = []
             recent = await self.db.get_plugin_data("Topics", "rss_recent_keys")
             if recent is None:
-                await self.db.set_plugin_data("Topics", "rss_recent_keys", "[]")
+                defaults.append(("rss_recent_keys", "[]"))
             last_feed_idx = await self.db.get_plugin_data("Topics", "rss_last_feed_idx")
             if last_feed_idx is None:
-                await self.db.set_plugin_data("Topics", "rss_last_feed_idx", "0")
+                defaults.append(("rss_last_feed_idx", "0"))
+            await self.db.set_plugin_data_many("Topics", defaults)
         except asyncio.CancelledError:
             raise
         except Exception as e:
@@ -1,17 +1,25 @@
 import atexit
+import functools
 import os
+import signal
 import subprocess
 import sys
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 import click
-import psutil
 
 from ..shared.exceptions import ConfigurationError
 from ..shared.utils import format_duration_hms
-from . import main as app_main
+
+_IS_LINUX = sys.platform == "linux"
+
+
+class _ProcessSample(NamedTuple):
+    rss_bytes: int
+    cpu_seconds: float
+    create_time: float
 
 
 def _pid_file_path() -> Path:
@@ -61,6 +69,89 @@ def _remove_pid_file(pid_file: Path, *, expected_pid: int | None = None) -> None
         return
 
 
+@functools.cache
+def _linux_boot_time() -> float:
+    with open("/proc/stat", "rb") as f:
+        for line in f:
+            if line.startswith(b"btime"):
+                return float(line.split()[1])
+    raise OSError("btime not found in /proc/stat")
+
+
+def _linux_sample_process(pid: int) -> _ProcessSample | None:
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    fields = raw[raw.rfind(b")") + 2 :].split()
+    if len(fields) < 22 or fields[0] in (b"Z", b"X"):
+        return None
+    clk_tck = os.sysconf("SC_CLK_TCK")
+    return _ProcessSample(
+        rss_bytes=int(fields[21]) * os.sysconf("SC_PAGE_SIZE"),
+        cpu_seconds=(int(fields[11]) + int(fields[12])) / clk_tck,
+        create_time=_linux_boot_time() + int(fields[19]) / clk_tck,
+    )
+
+
+def _psutil_sample_process(pid: int) -> _ProcessSample | None:
+    import psutil
+
+    try:
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            if proc.status() == psutil.STATUS_ZOMBIE:
+                return None
+            cpu_times = proc.cpu_times()
+            return _ProcessSample(
+                rss_bytes=proc.memory_info().rss,
+                cpu_seconds=cpu_times.user + cpu_times.system,
+                create_time=proc.create_time(),
+            )
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+def _sample_process(pid: int) -> _ProcessSample | None:
+    if _IS_LINUX:
+        return _linux_sample_process(pid)
+    return _psutil_sample_process(pid)
+
+
+def _pid_exists(pid: int) -> bool:
+    if _IS_LINUX:
+        return _linux_sample_process(pid) is not None
+    import psutil
+
+    return psutil.pid_exists(pid)
+
+
+def _wait_pid(pid: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while _pid_exists(pid):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def _signal_process(pid: int, *, force: bool) -> None:
+    if _IS_LINUX:
+        os.kill(pid, signal.SIGKILL if force else signal.SIGTERM)
+        return
+    import psutil
+
+    try:
+        proc = psutil.Process(pid)
+        if force:
+            proc.kill()
+        else:
+            proc.terminate()
+    except psutil.NoSuchProcess as e:
+        raise ProcessLookupError(pid) from e
+
+
 def _should_daemonize() -> bool:
     if os.environ.get("TWIPSYBOT_UP_CHILD") == "1":
         return False
@@ -87,6 +178,8 @@ def _spawn_detached(argv: list[str], *, env: dict[str, str]) -> subprocess.Popen
 
 
 def _run_up_foreground(pid_file: Path) -> int:
+    from . import main as app_main
+
     pid = os.getpid()
     pid_file.write_text(str(pid), encoding="utf-8")
     atexit.register(_remove_pid_file, pid_file, expected_pid=pid)
@@ -106,7 +199,7 @@ def _run_up_daemon(pid_file: Path) -> int:
     deadline = time.time() + 5.0
     while time.time() < deadline:
         pid = _read_pid(pid_file)
-        if pid is not None and pid == proc.pid and psutil.pid_exists(pid):
+        if pid is not None and pid == proc.pid and _pid_exists(pid):
             return 0
         time.sleep(0.05)
     print("failed to start twipsybot", file=sys.stderr)
@@ -119,7 +212,7 @@ def _cmd_up() -> int:
     _remove_stop_file(_stop_file_path())
     if pid_file.exists():
         pid = _read_pid(pid_file)
-        if pid and psutil.pid_exists(pid):
+        if pid and _pid_exists(pid):
             print(f"twipsybot is already running (pid={pid})", file=sys.stderr)
             return 2
         _remove_pid_file(pid_file)
@@ -152,27 +245,12 @@ def _stop_process(pid_file: Path, pid: int) -> None:
     stop_file = _stop_file_path()
     _write_stop_file(stop_file)
     try:
-        proc = psutil.Process(pid)
-    except psutil.NoSuchProcess:
-        _remove_stop_file(stop_file)
-        _remove_pid_file(pid_file)
-        return
-
-    try:
-        proc.wait(timeout=5)
-        _remove_stop_file(stop_file)
-        _remove_pid_file(pid_file)
-        return
-    except psutil.TimeoutExpired:
-        pass
-
-    try:
-        proc.terminate()
-        try:
-            proc.wait(timeout=5)
-        except psutil.TimeoutExpired:
-            proc.kill()
-    except psutil.NoSuchProcess:
+        if _wait_pid(pid, 5):
+            return
+        _signal_process(pid, force=False)
+        if not _wait_pid(pid, 5):
+            _signal_process(pid, force=True)
+    except ProcessLookupError:
         return
     finally:
         _remove_stop_file(stop_file)
@@ -186,7 +264,7 @@ def _cmd_down() -> int:
         return 2
 
     pid = _read_pid(pid_file)
-    if not pid or not psutil.pid_exists(pid):
+    if not pid or not _pid_exists(pid):
         _remove_pid_file(pid_file)
         print("twipsybot is not running", file=sys.stderr)
         return 2
@@ -195,10 +273,6 @@ def _cmd_down() -> int:
         _stop_process(pid_file, pid)
         print(f"twipsybot stopped (pid={pid})", file=sys.stdout)
         return 0
-    except psutil.NoSuchProcess:
-        _remove_pid_file(pid_file)
-        print("twipsybot stopped", file=sys.stdout)
-        return 0
     except Exception as e:
         print(f"failed to stop twipsybot: {e}", file=sys.stderr)
         return 1
@@ -209,12 +283,10 @@ def _cmd_restart() -> int:
     print("twipsybot restarting...", file=sys.stdout)
     if pid_file.exists():
         pid = _read_pid(pid_file)
-        if pid and psutil.pid_exists(pid):
+        if pid and _pid_exists(pid):
             print(f"stopping twipsybot (pid={pid})...", file=sys.stdout)
             try:
                 _stop_process(pid_file, pid)
-            except psutil.NoSuchProcess:
-                pass
             except Exception as e:
                 print(f"failed to stop twipsybot: {e}", file=sys.stderr)
                 return 1
@@ -231,38 +303,35 @@ def _cmd_status() -> int:
         return 2
 
     pid = _read_pid(pid_file)
-    if not pid or not psutil.pid_exists(pid):
-        _remove_pid_file(pid_file)
-        print("stopped", file=sys.stdout)
-        return 2
-
-    try:
-        proc = psutil.Process(pid)
-    except psutil.NoSuchProcess:
+    sample = _sample_process(pid) if pid else None
+    if not pid or sample is None:
         _remove_pid_file(pid_file)
         print("stopped", file=sys.stdout)
         return 2
 
+    create_time = sample.create_time
+    prev: tuple[float, float] | None = None
     is_tty = sys.stdout.isatty()
+    out_fd = sys.stdout.fileno() if is_tty else -1
+    out_buf = bytearray(b"\r")
     try:
         while True:
-            if not proc.is_running():
-                print("stopped", file=sys.stdout)
-                return 2
-            try:
-                mem = proc.memory_info().rss / (1024 * 1024)
-                cpu = proc.cpu_percent(interval=None)
-                uptime = format_duration_hms(time.time() - proc.create_time())
-                line = (
-                    f"running pid={pid} uptime={uptime} cpu={cpu:.1f}% rss={mem:.1f}MB"
-                )
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
+            sample = _sample_process(pid)
+            if sample is None or sample.create_time != create_time:
                 print("stopped", file=sys.stdout)
                 return 2
+            now = time.monotonic()
+            cpu = 0.0
+            if prev is not None and now > prev[1]:
+                cpu = (sample.cpu_seconds - prev[0]) / (now - prev[1]) * 100
+            prev = (sample.cpu_seconds, now)
+            mem = sample.rss_bytes / (1024 * 1024)
+            uptime = format_duration_hms(time.time() - create_time)
+            line = f"running pid={pid} uptime={uptime} cpu={cpu:.1f}% rss={mem:.1f}MB"
 
             if is_tty:
-                sys.stdout.write("\r" + line + " " * 10)
-                sys.stdout.flush()
+                out_buf[1:] = line.encode().ljust(len(out_buf) - 1)
+                os.write(out_fd, out_buf)
             else:
                 print(line, file=sys.stdout)
 
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, Any
 from loguru import logger
 
 from ...shared.config_keys import ConfigKeys
+from ...shared.constants import CHAT_ROOM_PREFIX
 from ...shared.utils import (
     extract_chat_text,
     extract_first_text,
@@ -37,6 +38,13 @@ class _ChatContext:
 class ChatHandler:
     def __init__(self, bot: "MisskeyBot"):
         self.bot = bot
+        self._dump_enabled = False
+        bot.config.subscribe(self._on_config_changed)
+        self._on_config_changed()
+
+    def _on_config_changed(self) -> None:
+        config = self.bot.config
+        self._dump_enabled = bool(config.get(ConfigKeys.LOG_DUMP_EVENTS))
 
     async def handle(self, message: dict[str, Any]) -> None:
         if not self.bot.config.get(ConfigKeys.BOT_RESPONSE_CHAT):
@@ -46,11 +54,8 @@ class ChatHandler:
             return
         if self.bot.bot_user_id and extract_user_id(message) == self.bot.bot_user_id:
             return
-        maybe_log_event_dump(
-            bool(self.bot.config.get(ConfigKeys.LOG_DUMP_EVENTS)),
-            kind="Chat",
-            payload=message,
-        )
+        if self._dump_enabled:
+            maybe_log_event_dump(True, kind="Chat", payload=message)
         try:
             await self._process(message)
         except asyncio.CancelledError:
@@ -189,7 +194,7 @@ class ChatHandler:
                 f"Room chat from @{username} does not mention the bot; skipping"
             )
             return None
-        conversation_id = f"room:{room_id}" if room_id else user_id
+        conversation_id = f"{CHAT_ROOM_PREFIX}{room_id}" if room_id else user_id
         actor_id = room_id or user_id
         room_label = room_name or room_id
         return _ChatContext(
@@ -1,10 +1,12 @@
 import asyncio
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from ...shared.config_keys import ConfigKeys
+from ...shared.constants import MENTION_PARSE_CACHE_MAX
 from ...shared.utils import (
     extract_note_text,
     extract_user_handle,
@@ -25,11 +27,36 @@ class MentionContext:
     text: str
     user_id: str | None
     username: str | None
+    note_data: dict[str, Any] | None = None
 
 
 class MentionHandler:
     def __init__(self, bot: "MisskeyBot"):
         self.bot = bot
+        self._dump_enabled = False
+        self._respond_mentions = False
+        self._token_username: str | None = None
+        self._self_at = ""
+        self._self_prefix = ""
+        self._parse_cache: OrderedDict[tuple[Any, str], MentionContext] = OrderedDict()
+        bot.config.subscribe(self._on_config_changed)
+        self._on_config_changed()
+
+    def _refresh_self_tokens(self) -> str | None:
+        username = self.bot.bot_username
+        if username != self._token_username:
+            self._token_username = username
+            self._self_at = f"@{username}" if username else ""
+            self._self_prefix = f"{username}@" if username else ""
+        return username
+
+    def _is_bot_mentioned(self, text: str) -> bool:
+        return bool(text and self._refresh_self_tokens() and self._self_at in text)
+
+    def _on_config_changed(self) -> None:
+        config = self.bot.config
+        self._dump_enabled = bool(config.get(ConfigKeys.LOG_DUMP_EVENTS))
+        self._respond_mentions = bool(config.get(ConfigKeys.BOT_RESPONSE_MENTION))
 
     def _is_self_mention(self, mention: MentionContext) -> bool:
         if (
@@ -38,12 +65,17 @@ class MentionHandler:
             and mention.user_id == self.bot.bot_user_id
         ):
             return True
-        if not (self.bot.bot_username and mention.username):
+        username = self._refresh_self_tokens()
+        if not (username and mention.username):
             return False
-        return mention.username == self.bot.bot_username or mention.username.startswith(
-            f"{self.bot.bot_username}@"
+        return mention.username == username or mention.username.startswith(
+            self._self_prefix
         )
 
+    def _is_self_authored(self, note_data: dict[str, Any]) -> bool:
+        bot_user_id = self.bot.bot_user_id
+        return bool(bot_user_id) and extract_user_id(note_data) == bot_user_id
+
     @staticmethod
     def _format_mention_reply(mention: MentionContext, text: str) -> str:
         return f"@{mention.username}\n{text}" if mention.username else text
@@ -67,7 +99,7 @@ class MentionHandler:
             return False
         if is_reply_event:
             return reply_to_bot
-        return self.bot.is_bot_mentioned(text) or self._mentions_bot(note_data)
+        return self._is_bot_mentioned(text) or self._mentions_bot(note_data)
 
     def _is_reply_to_bot(self, note_data: dict[str, Any]) -> bool:
         replied = note_data.get("reply")
@@ -85,17 +117,18 @@ class MentionHandler:
         )
 
     def _parse_reply_text(self, note_data: dict[str, Any]) -> str:
-        parts: list[str] = []
-        if t := extract_note_text(note_data.get("reply"), include_cw=True):
-            parts.append(t)
-        if t := extract_note_text(note_data, include_cw=True):
-            parts.append(t)
-        return "\n\n".join(parts).strip()
+        replied = extract_note_text(note_data.get("reply"), include_cw=True)
+        current = extract_note_text(note_data, include_cw=True)
+        if replied and current:
+            return f"{replied}\n\n{current}"
+        return replied or current
 
     async def _build_mention_prompt(
         self, mention: MentionContext, note: dict[str, Any]
     ) -> str:
-        note_data = normalize_payload(note, kind="mention")
+        note_data = mention.note_data
+        if note_data is None:
+            note_data = normalize_payload(note, kind="mention")
         base = mention.text.strip()
         if not note_data:
             return base
@@ -117,9 +150,12 @@ class MentionHandler:
         return f"Quote:\n{quoted_text}".strip()
 
     async def handle(self, note: dict[str, Any]) -> None:
-        if not self.bot.config.get(ConfigKeys.BOT_RESPONSE_MENTION):
+        if not self._respond_mentions:
             return
-        mention = self._parse(note)
+        note_data = normalize_payload(note, kind="mention")
+        if note_data and self._is_self_authored(note_data):
+            return
+        mention = self._parse(note, note_data)
         if not mention.mention_id or self._is_self_mention(mention):
             return
         if mention.user_id and self.bot.is_response_blacklisted_user(
@@ -169,14 +205,26 @@ class MentionHandler:
         except Exception:
             logger.exception("Error handling mention")
 
-    def _parse(self, note: dict[str, Any]) -> MentionContext:
+    def _parse(self, note: dict[str, Any], note_data: dict[str, Any]) -> MentionContext:
+        note_id = note.get("id")
+        if not isinstance(note_id, str) or not note_id:
+            return self._parse_note(note, note_data)
+        cache_key = (note.get("type"), note_id)
+        if (cached := self._parse_cache.get(cache_key)) is not None:
+            self._parse_cache.move_to_end(cache_key)
+            return cached
+        mention = self._parse_note(note, note_data)
+        self._parse_cache[cache_key] = mention
+        if len(self._parse_cache) > MENTION_PARSE_CACHE_MAX:
+            self._parse_cache.popitem(last=False)
+        return mention
+
+    def _parse_note(
+        self, note: dict[str, Any], note_data: dict[str, Any]
+    ) -> MentionContext:
         try:
-            maybe_log_event_dump(
-                bool(self.bot.config.get(ConfigKeys.LOG_DUMP_EVENTS)),
-                kind="Mention",
-                payload=note,
-            )
-            note_data = normalize_payload(note, kind="mention")
+            if self._dump_enabled:
+                maybe_log_event_dump(True, kind="Mention", payload=note)
             if not note_data:
                 return MentionContext(None, None, "", None, None)
             note_type = note.get("type")
@@ -206,7 +254,9 @@ class MentionHandler:
                         f"Mention from @{display} does not mention the bot; skipping"
                     )
                 note_id = None
-            return MentionContext(note_id, reply_target_id, text, user_id, username)
+            return MentionContext(
+                note_id, reply_target_id, text, user_id, username, note_data
+            )
         except Exception:
             logger.exception("Failed to parse message data")
             return MentionContext(None, None, "", None, None)
@@ -13,13 +13,17 @@ if TYPE_CHECKING:
 class NotificationHandler:
     def __init__(self, bot: "MisskeyBot"):
         self.bot = bot
+        self._dump_enabled = False
+        bot.config.subscribe(self._on_config_changed)
+        self._on_config_changed()
+
+    def _on_config_changed(self) -> None:
+        config = self.bot.config
+        self._dump_enabled = bool(config.get(ConfigKeys.LOG_DUMP_EVENTS))
 
     async def handle(self, notification: dict[str, Any]) -> None:
-        maybe_log_event_dump(
-            bool(self.bot.config.get(ConfigKeys.LOG_DUMP_EVENTS)),
-            kind="Notification",
-            payload=notification,
-        )
+        if self._dump_enabled:
+            maybe_log_event_dump(True, kind="Notification", payload=notification)
         try:
             await self.bot.plugin_manager.call_plugin_hook(
                 "on_notification", notification
@@ -28,7 +28,7 @@ class AutoPostService:
             return False
         return True
 
-    def reset_daily_counters(self) -> None:
+    async def reset_daily_counters(self) -> None:
         self.posts_today = 0
         logger.debug("Post counter reset")
 
@@ -1,4 +1,5 @@
 import asyncio
+import time
 from typing import Any
 
 from loguru import logger
@@ -8,6 +9,7 @@ from ...clients.misskey.misskey_api import MisskeyAPI
 from ...clients.misskey.streaming import StreamingClient
 from ...shared.config import Config
 from ...shared.config_keys import ConfigKeys
+from ...shared.constants import ANTENNA_CACHE_TTL
 from ...shared.utils import normalize_tokens
 from .handlers import BotHandlers
 from .runtime import BotRuntime
@@ -29,21 +31,26 @@ class StreamingConnector:
         self._runtime = runtime
         self._handlers = handlers
         self._timeline_channels = self._load_timeline_channels()
+        self._antenna_index: (
+            tuple[float, int, set[str], dict[str, list[str]]] | None
+        ) = None
 
-    def load_timeline_channels(self) -> set[str]:
+    def load_timeline_channels(self) -> frozenset[str]:
         self._timeline_channels = self._load_timeline_channels()
-        return set(self._timeline_channels)
+        return self._timeline_channels
 
-    def _load_timeline_channels(self) -> set[str]:
+    def _load_timeline_channels(self) -> frozenset[str]:
         if not self._config.get(ConfigKeys.BOT_TIMELINE_ENABLED):
-            return set()
+            return frozenset()
         mapping = {
             ConfigKeys.BOT_TIMELINE_HOME: ChannelType.HOME_TIMELINE.value,
             ConfigKeys.BOT_TIMELINE_LOCAL: ChannelType.LOCAL_TIMELINE.value,
             ConfigKeys.BOT_TIMELINE_HYBRID: ChannelType.HYBRID_TIMELINE.value,
             ConfigKeys.BOT_TIMELINE_GLOBAL: ChannelType.GLOBAL_TIMELINE.value,
         }
-        return {channel for key, channel in mapping.items() if self._config.get(key)}
+        return frozenset(
+            channel for key, channel in mapping.items() if self._config.get(key)
+        )
 
     def _load_antenna_selectors(self) -> list[str]:
         return normalize_tokens(self._config.get(ConfigKeys.BOT_TIMELINE_ANTENNA_IDS))
@@ -88,12 +95,29 @@ class StreamingConnector:
             return ""
         return candidates[0]
 
+    def invalidate_antenna_cache(self) -> None:
+        self._antenna_index = None
+        self._misskey.invalidate_antennas_cache()
+
+    async def _get_antenna_index(self) -> tuple[set[str], dict[str, list[str]]]:
+        now = time.monotonic()
+        version = self._config.version
+        if (cached := self._antenna_index) is not None:
+            cached_at, cached_version, antenna_ids, name_to_ids = cached
+            if cached_version == version and now - cached_at < ANTENNA_CACHE_TTL:
+                return antenna_ids, name_to_ids
+        antennas = await self._misskey.list_antennas()
+        antenna_ids, name_to_ids = self._build_antenna_index(antennas)
+        self._antenna_index = (now, version, antenna_ids, name_to_ids)
+        return antenna_ids, name_to_ids
+
     async def _resolve_antenna_ids(self, selectors: list[str]) -> list[str]:
+        if not selectors:
+            return []
         normalized = [s.strip() for s in selectors if isinstance(s, str) and s.strip()]
         if not normalized:
             return []
-        antennas = await self._misskey.list_antennas()
-        antenna_ids, name_to_ids = self._build_antenna_index(antennas)
+        antenna_ids, name_to_ids = await self._get_antenna_index()
         resolved = [
             self._resolve_antenna_selector(s, antenna_ids, name_to_ids)
             for s in normalized
@@ -1,11 +1,13 @@
 import asyncio
-import inspect
+import sys
+from collections import deque
 from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, nullcontext
 from datetime import UTC, datetime, timedelta
+from itertools import islice
 from typing import Any
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from cachetools import TTLCache
 from loguru import logger
 
 from ...clients.misskey.misskey_api import MisskeyAPI
@@ -14,11 +16,13 @@ from ...clients.misskey.transport import TCPClient
 from ...clients.openai import OpenAIAPI
 from ...db.sqlite import DBManager
 from ...plugin.manager import PluginManager
+from ...shared.cache import TTLLRUCache
 from ...shared.config import Config
 from ...shared.config_keys import ConfigKeys
 from ...shared.constants import (
     CHAT_CACHE_MAX_USERS,
     CHAT_CACHE_TTL,
+    CHAT_ROOM_PREFIX,
     USER_LOCK_CACHE_MAX,
     USER_LOCK_TTL,
 )
@@ -31,6 +35,11 @@ from .runtime import BotRuntime
 
 __all__ = ("MisskeyBot",)
 
+_NULL_ASYNC_CM = nullcontext()
+_ROOM_PREFIX_LEN = len(CHAT_ROOM_PREFIX)
+
+AfterSent = Callable[[str], Awaitable[None] | None]
+
 
 class MisskeyBot:
     def __init__(self, config: Config):
@@ -80,13 +89,15 @@ class MisskeyBot:
         self.system_prompt = config.get(ConfigKeys.BOT_SYSTEM_PROMPT, "")
         self.bot_user_id = None
         self.bot_username = None
-        self._user_locks: TTLCache[str, asyncio.Lock] = TTLCache(
+        self._user_locks: TTLLRUCache[str, asyncio.Lock] = TTLLRUCache(
             maxsize=USER_LOCK_CACHE_MAX, ttl=USER_LOCK_TTL
         )
-        self._chat_histories: TTLCache[str, list[dict[str, str]]] = TTLCache(
+        self._chat_histories: TTLLRUCache[str, deque[dict[str, str]]] = TTLLRUCache(
             maxsize=CHAT_CACHE_MAX_USERS, ttl=CHAT_CACHE_TTL
         )
+        self._history_limit_cache: tuple[int, int] | None = None
         self.handlers = BotHandlers(self)
+        config.subscribe(self._on_config_changed)
         self.connect = StreamingConnector(
             config=config,
             misskey=self.misskey,
@@ -96,26 +107,33 @@ class MisskeyBot:
         )
         logger.info("Bot initialized")
 
+    def _on_config_changed(self) -> None:
+        self.streaming.log_dump_events = bool(
+            self.config.get(ConfigKeys.LOG_DUMP_EVENTS)
+        )
+
     @staticmethod
     def _actor_key(user_id: str | None, username: str | None) -> str | None:
         if user_id:
-            return f"id:{user_id}"
+            return sys.intern(f"id:{user_id}")
         if username:
-            return f"name:{username}"
+            return sys.intern(f"name:{username}")
         return None
 
-    def _get_actor_lock(
+    def _get_actor_lock(self, key: str) -> asyncio.Lock:
+        lock = self._user_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._user_locks[key] = lock
+        return lock
+
+    def lock_actor(
         self, user_id: str | None, username: str | None
-    ) -> asyncio.Lock:
+    ) -> AbstractAsyncContextManager[Any]:
         key = self._actor_key(user_id, username)
         if not key:
-            return asyncio.Lock()
-        if key not in self._user_locks:
-            self._user_locks[key] = asyncio.Lock()
-        return self._user_locks[key]
-
-    def lock_actor(self, user_id: str | None, username: str | None):
-        return self._get_actor_lock(user_id, username)
+            return _NULL_ASYNC_CM
+        return self._get_actor_lock(key)
 
     def is_response_blacklisted_user(self, *, user_id: str, handle: str | None) -> bool:
         return self.limits.is_response_blacklisted_user(user_id=user_id, handle=handle)
@@ -148,7 +166,7 @@ class MisskeyBot:
         user_id: str | None,
         send_reply: Callable[[str], Awaitable[None]],
         log_sent: Callable[[str], None],
-        after_sent: Callable[[str], Any] | None = None,
+        after_sent: AfterSent | None = None,
     ) -> bool:
         if not (isinstance(result, dict) and result.get("handled")):
             return False
@@ -160,10 +178,8 @@ class MisskeyBot:
         log_sent(response)
         if user_id:
             await self.record_response(user_id, count_turn=True)
-        if after_sent is not None:
-            maybe = after_sent(response)
-            if inspect.isawaitable(maybe):
-                await maybe
+        if after_sent is not None and (maybe := after_sent(response)) is not None:
+            await maybe
         return True
 
     async def run_response_pipeline(
@@ -178,11 +194,13 @@ class MisskeyBot:
         plugin_call: Callable[[], Awaitable[list[Any]]],
         plugin_kind: str,
         plugin_log_sent: Callable[[str], None],
-        plugin_after_sent: Callable[[str], Any] | None = None,
+        plugin_after_sent: AfterSent | None = None,
         ai_generate: Callable[[], Awaitable[str | None]],
         ai_log_sent: Callable[[str], None],
-        ai_after_sent: Callable[[str], Any] | None = None,
+        ai_after_sent: AfterSent | None = None,
     ) -> None:
+        if user_id:
+            self.limits.prefetch_response_limit_state(user_id)
         async with self.lock_actor(actor_id, actor_name):
             log_incoming()
             if user_id and await self.maybe_send_blocked_reply(
@@ -200,22 +218,32 @@ class MisskeyBot:
                     after_sent=plugin_after_sent,
                 ):
                     return
+            reservation = (
+                await self.limits.reserve_response(user_id) if user_id else None
+            )
+        try:
             reply = await ai_generate()
-            if not reply:
-                return
-            await send_reply(reply)
-            ai_log_sent(reply)
-            if user_id:
-                await self.record_response(user_id, count_turn=True)
-            if ai_after_sent is not None:
-                maybe = ai_after_sent(reply)
-                if inspect.isawaitable(maybe):
-                    await maybe
+            if reply:
+                await send_reply(reply)
+        except BaseException:
+            if reservation is not None:
+                await self.limits.release_response(reservation)
+            raise
+        if not reply:
+            if reservation is not None:
+                await self.limits.release_response(reservation)
+            return
+        ai_log_sent(reply)
+        if ai_after_sent is None:
+            return
+        async with self.lock_actor(actor_id, actor_name):
+            if (maybe := ai_after_sent(reply)) is not None:
+                await maybe
 
     async def record_response(self, user_id: str, *, count_turn: bool) -> None:
         await self.limits.record_response(user_id, count_turn=count_turn)
 
-    def load_timeline_channels(self) -> set[str]:
+    def load_timeline_channels(self) -> frozenset[str]:
         return self.connect.load_timeline_channels()
 
     async def get_streaming_channels(self):
@@ -224,6 +252,26 @@ class MisskeyBot:
     async def restart_streaming(self) -> None:
         await self.connect.restart_streaming()
 
+    def _resolve_history_limit(self, limit: int | None) -> int:
+        if isinstance(limit, int):
+            return limit
+        version = self.config.version
+        cached = self._history_limit_cache
+        if cached is None or cached[0] != version:
+            cached = (
+                version,
+                resolve_history_limit(
+                    self.config.get(ConfigKeys.BOT_RESPONSE_CHAT_MEMORY), None
+                ),
+            )
+            self._history_limit_cache = cached
+        return cached[1]
+
+    @staticmethod
+    def _history_maxlen(limit_value: int) -> int | None:
+        window = limit_value * 2
+        return window if window > 0 else None
+
     async def get_or_load_chat_history(
         self,
         conversation_id: str,
@@ -232,42 +280,42 @@ class MisskeyBot:
         user_id: str | None = None,
         room_id: str | None = None,
     ) -> list[dict[str, str]]:
-        limit_value = resolve_history_limit(
-            self.config.get(ConfigKeys.BOT_RESPONSE_CHAT_MEMORY), limit
-        )
+        limit_value = self._resolve_history_limit(limit)
+        maxlen = self._history_maxlen(limit_value)
         if (cached := self._chat_histories.get(conversation_id)) is not None:
-            return list(cached)[-max(0, limit_value * 2) :]
-        if conversation_id.startswith("room:"):
-            room_id = room_id or conversation_id.removeprefix("room:")
+            if maxlen is None or len(cached) <= maxlen:
+                return list(cached)
+            return list(islice(cached, len(cached) - maxlen, None))
+        if conversation_id.startswith(CHAT_ROOM_PREFIX):
+            room_id = room_id or conversation_id[_ROOM_PREFIX_LEN:]
         history = await self.handlers.chat.get_chat_history(
             user_id=user_id, room_id=room_id, limit=limit_value
         )
-        trimmed = history[-max(0, limit_value * 2) :]
-        self._chat_histories[conversation_id] = trimmed
+        trimmed = deque(history, maxlen=maxlen)
+        self._chat_histories[sys.intern(conversation_id)] = trimmed
         return list(trimmed)
 
     def append_chat_turn(
         self, user_id: str, user_text: str, assistant_text: str, limit: int | None
     ) -> None:
-        limit_value = resolve_history_limit(
-            self.config.get(ConfigKeys.BOT_RESPONSE_CHAT_MEMORY), limit
-        )
-        history = list(self._chat_histories.get(user_id) or [])
-        last = next(reversed(history), None)
+        limit_value = self._resolve_history_limit(limit)
+        maxlen = self._history_maxlen(limit_value)
+        history = self._chat_histories.get(user_id)
+        if history is None or history.maxlen != maxlen:
+            history = deque(history or (), maxlen=maxlen)
         if user_text and not (
-            isinstance(last, dict)
-            and last.get("role") == "user"
-            and last.get("content") == user_text
+            history
+            and history[-1].get("role") == "user"
+            and history[-1].get("content") == user_text
         ):
             history.append({"role": "user", "content": user_text})
-        last = next(reversed(history), None)
         if assistant_text and not (
-            isinstance(last, dict)
-            and last.get("role") == "assistant"
-            and last.get("content") == assistant_text
+            history
+            and history[-1].get("role") == "assistant"
+            and history[-1].get("content") == assistant_text
         ):
             history.append({"role": "assistant", "content": assistant_text})
-        self._chat_histories[user_id] = history[-max(0, limit_value * 2) :]
+        self._chat_histories[sys.intern(user_id)] = history
 
     async def __aenter__(self):
         await self.start()
@@ -303,13 +351,15 @@ class MisskeyBot:
         await self.plugin_manager.call_plugin_hook("on_startup")
 
     def _setup_scheduler(self) -> None:
-        cron_jobs = [
-            (self.handlers.auto_post.reset_daily_counters, 0),
-            (self.db.vacuum, 2),
-            (self.db.cleanup_response_limit_state, 3),
-        ]
-        for func, hour in cron_jobs:
-            self.scheduler.add_job(func, "cron", hour=hour, minute=0, second=0)
+        self.scheduler.add_job(
+            self._nightly_maintenance,
+            "cron",
+            hour=0,
+            minute=0,
+            second=0,
+            id="nightly_maintenance",
+            replace_existing=True,
+        )
         interval_minutes = self.config.get(ConfigKeys.BOT_AUTO_POST_INTERVAL)
         enabled = bool(self.config.get(ConfigKeys.BOT_AUTO_POST_ENABLED))
         logger.info(
@@ -325,6 +375,20 @@ class MisskeyBot:
         )
         self.scheduler.start()
 
+    async def _nightly_maintenance(self) -> None:
+        steps: list[tuple[str, Callable[[], Awaitable[Any]]]] = [
+            ("reset daily counters", self.handlers.auto_post.reset_daily_counters),
+            ("clean up response limit state", self.db.cleanup_response_limit_state),
+            ("vacuum database", self.db.vacuum),
+        ]
+        for name, step in steps:
+            try:
+                await step()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Nightly maintenance step failed ({name}): {e}")
+
     async def _setup_streaming(self) -> None:
         await self.connect.setup_streaming()
 
@@ -343,6 +407,12 @@ class MisskeyBot:
             await self.streaming.close()
             await self.misskey.close()
             await self.openai.close()
+            try:
+                await self.limits.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to persist response limit state: {e}")
             await self.db.close()
         except asyncio.CancelledError:
             raise
@@ -358,8 +428,7 @@ class MisskeyBot:
     def format_log_text(text: str, max_length: int = 50) -> str:
         if not text:
             return "None"
-        suffix = "..." if len(text) > max_length else ""
-        return f"{text[:max_length]}{suffix}"
+        return text if len(text) <= max_length else f"{text[:max_length]}..."
 
     @property
     def ai_config(self) -> dict[str, Any]:
@@ -1,3 +1,4 @@
+import asyncio
 import time
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
@@ -5,13 +6,18 @@ from datetime import timedelta
 from typing import Any
 from urllib.parse import urlparse
 
-from cachetools import TTLCache
+from loguru import logger
 from pytimeparse2 import parse as parse_duration
 
 from ...db.sqlite import DBManager
+from ...shared.cache import TTLLRUCache
 from ...shared.config import Config
 from ...shared.config_keys import ConfigKeys
-from ...shared.constants import RESPONSE_LIMIT_CACHE_MAX, RESPONSE_LIMIT_CACHE_TTL
+from ...shared.constants import (
+    RESPONSE_LIMIT_CACHE_MAX,
+    RESPONSE_LIMIT_CACHE_TTL,
+    RESPONSE_LIMIT_FLUSH_INTERVAL,
+)
 from ...shared.utils import normalize_tokens
 
 
@@ -20,6 +26,15 @@ class _ResponseLimitState:
     last_reply_ts: float | None = None
     turns: int = 0
     blocked_until_ts: float | None = None
+    dirty: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class ResponseReservation:
+    user_id: str
+    state: _ResponseLimitState
+    previous_ts: float | None
+    reserved_ts: float | None
 
 
 class ResponseLimiter:
@@ -33,37 +48,56 @@ class ResponseLimiter:
         self._config = config
         self._db = db
         self._instance_url = instance_url
-        self._response_limits: TTLCache[str, _ResponseLimitState] = TTLCache(
+        self._instance_host = (
+            urlparse(instance_url).hostname
+            if isinstance(instance_url, str) and instance_url
+            else None
+        )
+        self._response_limits: TTLLRUCache[str, _ResponseLimitState] = TTLLRUCache(
             maxsize=RESPONSE_LIMIT_CACHE_MAX,
             ttl=RESPONSE_LIMIT_CACHE_TTL,
         )
+        self._user_set_cache: dict[str, tuple[int, frozenset[str]]] = {}
+        self._duration_cache: dict[str, tuple[int, int]] = {}
+        self._dirty: dict[str, _ResponseLimitState] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+        self._state_loads: dict[str, asyncio.Task[_ResponseLimitState]] = {}
 
     @staticmethod
-    def _parse_user_list(value: Any) -> set[str]:
-        return set(normalize_tokens(value, lower=True))
+    def _parse_user_list(value: Any) -> frozenset[str]:
+        return frozenset(normalize_tokens(value, lower=True))
 
-    def _load_response_user_set(self, key: str) -> set[str]:
-        return self._parse_user_list(self._config.get(key))
+    def _load_response_user_set(self, key: str) -> frozenset[str]:
+        version = self._config.version
+        cached = self._user_set_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        users = self._parse_user_list(self._config.get(key))
+        self._user_set_cache[key] = (version, users)
+        return users
 
     def _canonicalize_user_handle(self, username: str) -> str | None:
-        if not isinstance(self._instance_url, str) or not self._instance_url:
-            return None
-        host = urlparse(self._instance_url).hostname
+        host = self._instance_host
         return f"{username}@{host}" if host else None
 
-    def _user_candidates(self, *, user_id: str, handle: str | None) -> set[str]:
-        candidates = {user_id.lower()}
-        if handle:
-            normalized = handle.lower().lstrip("@").strip()
-            if normalized:
-                candidates.add(normalized)
-                candidates.add(f"@{normalized}")
-                if "@" not in normalized and (
-                    canonical := self._canonicalize_user_handle(normalized)
-                ):
-                    candidates.add(canonical)
-                    candidates.add(f"@{canonical}")
-        return candidates
+    def _matches_user_set(
+        self, users: frozenset[str], *, user_id: str, handle: str | None
+    ) -> bool:
+        if user_id.lower() in users:
+            return True
+        if not handle:
+            return False
+        normalized = handle.lower().lstrip("@").strip()
+        if not normalized:
+            return False
+        if normalized in users or f"@{normalized}" in users:
+            return True
+        if "@" in normalized:
+            return False
+        canonical = self._canonicalize_user_handle(normalized)
+        return canonical is not None and (
+            canonical in users or f"@{canonical}" in users
+        )
 
     def _is_response_whitelisted_user(
         self, *, user_id: str, handle: str | None
@@ -71,19 +105,13 @@ class ResponseLimiter:
         whitelist = self._load_response_user_set(ConfigKeys.BOT_RESPONSE_WHITELIST)
         if not whitelist:
             return False
-        return any(
-            c in whitelist
-            for c in self._user_candidates(user_id=user_id, handle=handle)
-        )
+        return self._matches_user_set(whitelist, user_id=user_id, handle=handle)
 
     def is_response_blacklisted_user(self, *, user_id: str, handle: str | None) -> bool:
         blacklist = self._load_response_user_set(ConfigKeys.BOT_RESPONSE_BLACKLIST)
         if not blacklist:
             return False
-        return any(
-            c in blacklist
-            for c in self._user_candidates(user_id=user_id, handle=handle)
-        )
+        return self._matches_user_set(blacklist, user_id=user_id, handle=handle)
 
     @staticmethod
     def _parse_duration_seconds(value: Any) -> int | None:
@@ -120,18 +148,55 @@ class ResponseLimiter:
         return None
 
     def _duration_config_seconds(self, key: str) -> int:
+        version = self._config.version
+        cached = self._duration_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
         seconds = self._parse_duration_seconds(self._config.get(key))
         if seconds is None:
-            return -1
+            seconds = -1
+        self._duration_cache[key] = (version, seconds)
         return seconds
 
-    async def _get_response_limit_state(self, user_id: str) -> _ResponseLimitState:
+    def _cached_response_limit_state(self, user_id: str) -> _ResponseLimitState | None:
         if user_id in self._response_limits:
             return self._response_limits[user_id]
+        if (pending := self._dirty.get(user_id)) is not None:
+            self._response_limits[user_id] = pending
+            return pending
+        return None
+
+    def prefetch_response_limit_state(self, user_id: str) -> None:
+        if user_id in self._state_loads:
+            return
+        if self._cached_response_limit_state(user_id) is not None:
+            return
+        task = asyncio.create_task(self._load_response_limit_state(user_id))
+        self._state_loads[user_id] = task
+        task.add_done_callback(lambda t: self._forget_state_load(user_id, t))
+
+    def _forget_state_load(
+        self, user_id: str, task: asyncio.Task[_ResponseLimitState]
+    ) -> None:
+        if self._state_loads.get(user_id) is task:
+            del self._state_loads[user_id]
+        if not task.cancelled():
+            task.exception()
+
+    async def _get_response_limit_state(self, user_id: str) -> _ResponseLimitState:
+        if (state := self._cached_response_limit_state(user_id)) is not None:
+            return state
+        if (task := self._state_loads.get(user_id)) is not None:
+            return await asyncio.shield(task)
+        return await self._load_response_limit_state(user_id)
+
+    async def _load_response_limit_state(self, user_id: str) -> _ResponseLimitState:
         last_reply_ts = None
         turns = 0
         blocked_until_ts = None
         row = await self._db.get_response_limit_state(user_id)
+        if (state := self._cached_response_limit_state(user_id)) is not None:
+            return state
         if row:
             last_reply_ts, turns, blocked_until_ts = row
             if blocked_until_ts == -1:
@@ -147,21 +212,54 @@ class ResponseLimiter:
     async def _save_response_limit_state(
         self, user_id: str, state: _ResponseLimitState
     ) -> None:
-        blocked_until_ts = state.blocked_until_ts
-        if blocked_until_ts == float("inf"):
-            blocked_until_ts = -1
-        await self._db.set_response_limit_state(
-            user_id=user_id,
-            last_reply_ts=state.last_reply_ts,
-            turns=state.turns,
-            blocked_until_ts=blocked_until_ts,
-        )
+        if not state.dirty:
+            return
+        self._dirty[user_id] = state
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
 
-    async def get_response_block_reply(
+    async def _flush_later(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(RESPONSE_LIMIT_FLUSH_INTERVAL)
+            try:
+                await self._flush_dirty()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to persist response limit state: {e}")
+
+    async def _flush_dirty(self) -> None:
+        if not self._dirty:
+            return
+        pending, self._dirty = self._dirty, {}
+        rows = []
+        for user_id, state in pending.items():
+            state.dirty = False
+            blocked_until_ts = state.blocked_until_ts
+            if blocked_until_ts == float("inf"):
+                blocked_until_ts = -1
+            rows.append((user_id, state.last_reply_ts, state.turns, blocked_until_ts))
+        try:
+            await self._db.set_response_limit_states(rows)
+        except BaseException:
+            for user_id, state in pending.items():
+                state.dirty = True
+                self._dirty.setdefault(user_id, state)
+            raise
+
+    async def flush(self) -> None:
+        task = self._flush_task
+        self._flush_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self._flush_dirty()
+
+    async def _evaluate_response_block(
         self, *, user_id: str, handle: str | None
-    ) -> str | None:
+    ) -> tuple[str | None, _ResponseLimitState | None]:
         if self._is_response_whitelisted_user(user_id=user_id, handle=handle):
-            return None
+            return None, None
         now = time.time()
         state = await self._get_response_limit_state(user_id)
         if (
@@ -171,16 +269,16 @@ class ResponseLimiter:
         ):
             state.turns = 0
             state.blocked_until_ts = None
-            await self._save_response_limit_state(user_id, state)
+            state.dirty = True
         if state.blocked_until_ts is not None and now < state.blocked_until_ts:
-            return self._config.get(ConfigKeys.BOT_RESPONSE_MAX_TURNS_REPLY)
+            return self._config.get(ConfigKeys.BOT_RESPONSE_MAX_TURNS_REPLY), state
         interval = self._duration_config_seconds(ConfigKeys.BOT_RESPONSE_RATE_LIMIT)
         if (
             interval > 0
             and state.last_reply_ts is not None
             and now - state.last_reply_ts < interval
         ):
-            return self._config.get(ConfigKeys.BOT_RESPONSE_RATE_LIMIT_REPLY)
+            return self._config.get(ConfigKeys.BOT_RESPONSE_RATE_LIMIT_REPLY), state
         max_turns = self._config.get(ConfigKeys.BOT_RESPONSE_MAX_TURNS)
         if isinstance(max_turns, int) and max_turns >= 0 and state.turns >= max_turns:
             release = self._duration_config_seconds(
@@ -190,9 +288,19 @@ class ResponseLimiter:
                 state.blocked_until_ts = float("inf")
             else:
                 state.blocked_until_ts = now + release
+            state.dirty = True
+            return self._config.get(ConfigKeys.BOT_RESPONSE_MAX_TURNS_REPLY), state
+        return None, state
+
+    async def get_response_block_reply(
+        self, *, user_id: str, handle: str | None
+    ) -> str | None:
+        reply, state = await self._evaluate_response_block(
+            user_id=user_id, handle=handle
+        )
+        if state is not None:
             await self._save_response_limit_state(user_id, state)
-            return self._config.get(ConfigKeys.BOT_RESPONSE_MAX_TURNS_REPLY)
-        return None
+        return reply
 
     async def maybe_send_blocked_reply(
         self,
@@ -201,16 +309,45 @@ class ResponseLimiter:
         handle: str | None,
         send_reply: Callable[[str], Awaitable[None]],
     ) -> bool:
-        blocked = await self.get_response_block_reply(user_id=user_id, handle=handle)
+        blocked, state = await self._evaluate_response_block(
+            user_id=user_id, handle=handle
+        )
+        if state is None:
+            return False
         if not blocked:
+            await self._save_response_limit_state(user_id, state)
             return False
-        await send_reply(blocked)
-        await self.record_response(user_id, count_turn=False)
+        try:
+            await send_reply(blocked)
+            self._record_on_state(state, count_turn=False)
+        finally:
+            await self._save_response_limit_state(user_id, state)
         return True
 
-    async def record_response(self, user_id: str, *, count_turn: bool) -> None:
-        state = await self._get_response_limit_state(user_id)
+    @staticmethod
+    def _record_on_state(state: _ResponseLimitState, *, count_turn: bool) -> None:
         state.last_reply_ts = time.time()
         if count_turn:
             state.turns += 1
+        state.dirty = True
+
+    async def record_response(self, user_id: str, *, count_turn: bool) -> None:
+        state = await self._get_response_limit_state(user_id)
+        self._record_on_state(state, count_turn=count_turn)
+        await self._save_response_limit_state(user_id, state)
+
+    async def reserve_response(self, user_id: str) -> ResponseReservation:
+        state = await self._get_response_limit_state(user_id)
+        previous_ts = state.last_reply_ts
+        self._record_on_state(state, count_turn=True)
         await self._save_response_limit_state(user_id, state)
+        return ResponseReservation(user_id, state, previous_ts, state.last_reply_ts)
+
+    async def release_response(self, reservation: ResponseReservation) -> None:
+        state = reservation.state
+        if state.turns > 0:
+            state.turns -= 1
+        if state.last_reply_ts == reservation.reserved_ts:
+            state.last_reply_ts = reservation.previous_ts
+        state.dirty = True
+        await self._save_response_limit_state(reservation.user_id, state)
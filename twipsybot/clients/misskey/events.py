@@ -1,20 +1,32 @@
 import asyncio
-import inspect
+import sys
+from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Any
 
 from loguru import logger
 
+from ...shared.constants import STREAM_QUEUE_MAX, STREAM_READ_FLUSH_DELAY
 from ...shared.utils import maybe_log_event_dump
 from .channels import CHAT_CHANNELS, NOTE_CHANNELS, ChannelType
 
 __all__ = ("_StreamingEventsMixin",)
 
+DedupKey = tuple[str, ...]
+
+_MAIN = ChannelType.MAIN.value
+_CHAT_USER = ChannelType.CHAT_USER.value
+_ANTENNA = ChannelType.ANTENNA.value
+
+_CHAT_DEDUP_TYPE = sys.intern("chatMessage")
+_CHAT_MESSAGE_TYPES = frozenset({sys.intern("newChatMessage"), sys.intern("message")})
+
 
 class _StreamingEventsMixin:
     async def _handle_channel_message(self, body: dict[str, Any]) -> None:
         channel_id = body.get("id")
         if channel_id not in self.channels:
-            logger.debug(f"Message received for unknown channel: {channel_id}")
+            logger.debug("Message received for unknown channel: {}", channel_id)
             return
         channel_info = self.channels[channel_id]
         channel_name = channel_info.get("name", "unknown")
@@ -33,20 +45,25 @@ class _StreamingEventsMixin:
         if isinstance(event_data, dict) and "streamingChannelId" not in event_data:
             event_data["streamingChannelId"] = channel_id
         event_id = self._extract_event_id(event_data, event_type)
-        if self._is_duplicate_event(event_id, event_type):
+        dedup_key = self._event_dedup_key(event_id, event_type)
+        if self._is_duplicate_event(dedup_key, event_id, event_type):
             return
-        self._track_event(event_id, event_type)
+        self._track_dedup_key(dedup_key)
         if event_type:
             logger.debug(
-                f"Received {channel_name} event: {event_type} (channel_id={channel_id}, event_id={event_id})"
+                "Received {} event: {} (channel_id={}, event_id={})",
+                channel_name,
+                event_type,
+                channel_id,
+                event_id,
             )
-        await self._enqueue_event(channel_name, event_data)
+        self._enqueue_event(channel_name, event_data)
 
     def _normalize_channel_event(
         self, channel_name: str, event_data: dict[str, Any]
     ) -> tuple[str | None, dict[str, Any]]:
         event_type = event_data.get("type")
-        if channel_name == ChannelType.MAIN.value:
+        if channel_name == _MAIN:
             return self._normalize_main_channel_event(event_type, event_data)
         if channel_name in CHAT_CHANNELS:
             return self._normalize_chat_channel_event(event_type, event_data)
@@ -59,7 +76,10 @@ class _StreamingEventsMixin:
         event_id = event_data.get("id")
         if event_id or event_type != "note":
             return event_id
-        inner_id = (event_data.get("body") or {}).get("id")
+        body = event_data.get("body")
+        if not isinstance(body, dict):
+            return None
+        inner_id = body.get("id")
         return inner_id if isinstance(inner_id, str) else None
 
     def _normalize_main_channel_event(
@@ -70,15 +90,8 @@ class _StreamingEventsMixin:
         payload = event_data.get("body")
         if not isinstance(payload, dict):
             return event_type, event_data
-        normalizers = {
-            "mention": lambda: self._wrap_note_event("mention", payload),
-            "reply": lambda: self._wrap_note_event("reply", payload),
-            "newChatMessage": lambda: self._wrap_new_chat_message(payload),
-            "notification": lambda: self._wrap_notification(payload),
-            "unreadNotification": lambda: self._wrap_notification(payload),
-        }
-        normalizer = normalizers.get(event_type)
-        return normalizer() if normalizer else (event_type, event_data)
+        normalizer = _MAIN_NORMALIZERS.get(event_type)
+        return normalizer(payload) if normalizer else (event_type, event_data)
 
     def _normalize_chat_channel_event(
         self, event_type: Any, event_data: dict[str, Any]
@@ -100,8 +113,9 @@ class _StreamingEventsMixin:
         value = container.get(key)
         return value if isinstance(value, dict) else None
 
+    @staticmethod
     def _wrap_note_event(
-        self, event_type: str, note: dict[str, Any]
+        event_type: str, note: dict[str, Any]
     ) -> tuple[str, dict[str, Any]]:
         note_id = note.get("id") if isinstance(note.get("id"), str) else None
         wrapped: dict[str, Any] = {"type": event_type, "note": note}
@@ -134,32 +148,31 @@ class _StreamingEventsMixin:
     async def _stop_workers(self) -> None:
         if not self._workers:
             return
-        while not self._event_queue.empty():
-            try:
-                self._event_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-        for _ in self._workers:
-            await self._event_queue.put(None)
+        self._event_buffer.clear()
+        self._event_buffer.extend([None] * len(self._workers))
+        self._event_ready.set()
         await asyncio.gather(*self._workers, return_exceptions=True)
         self._workers.clear()
 
-    async def _enqueue_event(self, channel_name: str, event_data: dict[str, Any]):
-        try:
-            await asyncio.wait_for(
-                self._event_queue.put((channel_name, event_data)),
-                timeout=self._queue_put_timeout,
-            )
-        except TimeoutError:
+    def _enqueue_event(self, channel_name: str, event_data: dict[str, Any]) -> None:
+        if len(self._event_buffer) >= STREAM_QUEUE_MAX:
             event_id = event_data.get("id", "unknown")
             event_type = event_data.get("type", "unknown")
             logger.warning(
                 f"Event queue congested; dropping event: {event_type} (id={event_id})"
             )
+            return
+        self._event_buffer.append((channel_name, event_data))
+        self._event_ready.set()
 
     async def _worker_loop(self) -> None:
+        buffer = self._event_buffer
+        ready = self._event_ready
         while True:
-            item = await self._event_queue.get()
+            while not buffer:
+                ready.clear()
+                await ready.wait()
+            item = buffer.popleft()
             if item is None:
                 return
             channel_name, event_data = item
@@ -196,14 +209,23 @@ class _StreamingEventsMixin:
         event_type: str,
         event_data: dict[str, Any],
     ) -> None:
-        if channel_name == ChannelType.MAIN.value:
-            await self._handle_main_channel_event(event_type, event_data)
-            return
-        if channel_name in CHAT_CHANNELS:
-            await self._handle_chat_channel_event(channel_name, event_type, event_data)
-            return
-        if channel_name in NOTE_CHANNELS:
-            await self._handle_note_channel_event(channel_name, event_type, event_data)
+        handler = self._channel_dispatch.get(channel_name)
+        if handler is not None:
+            await handler(channel_name, event_type, event_data)
+
+    def _build_channel_dispatch(
+        self,
+    ) -> dict[str, Callable[[str, str, dict[str, Any]], Awaitable[None]]]:
+        return {
+            _MAIN: self._handle_main_typed_event,
+            **dict.fromkeys(CHAT_CHANNELS, self._handle_chat_channel_event),
+            **dict.fromkeys(NOTE_CHANNELS, self._handle_note_channel_event),
+        }
+
+    async def _handle_main_typed_event(
+        self, _channel_name: str, event_type: str, event_data: dict[str, Any]
+    ) -> None:
+        await self._handle_main_channel_event(event_type, event_data)
 
     async def _handle_main_channel_event(
         self, event_type: str, event_data: dict[str, Any]
@@ -227,9 +249,7 @@ class _StreamingEventsMixin:
         message = dict(event_data)
         message["streamingChannelId"] = channel_id
         message["type"] = "message"
-        await self._handle_chat_channel_event(
-            ChannelType.CHAT_USER.value, "message", message
-        )
+        await self._handle_chat_channel_event(_CHAT_USER, "message", message)
 
     async def _handle_main_notification(self, event_data: dict[str, Any]) -> None:
         notification = self._extract_dict(event_data, "notification")
@@ -255,27 +275,28 @@ class _StreamingEventsMixin:
     def _log_unknown_main_event(
         self, event_type: str, event_data: dict[str, Any]
     ) -> None:
-        logger.debug(f"Unknown main channel event type: {event_type}")
+        logger.debug("Unknown main channel event type: {}", event_type)
         maybe_log_event_dump(self.log_dump_events, kind=event_type, payload=event_data)
 
     async def _handle_chat_channel_event(
         self, channel_name: str, event_type: str, event_data: dict[str, Any]
     ) -> None:
         if event_type != "message":
-            logger.debug(f"Unknown {channel_name} channel event type: {event_type}")
+            logger.debug("Unknown {} channel event type: {}", channel_name, event_type)
             maybe_log_event_dump(
                 self.log_dump_events, kind=event_type, payload=event_data
             )
             return
-        message = dict(event_data)
-        from_user_id = message.get("fromUserId")
+        message = event_data
+        from_user_id = event_data.get("fromUserId")
         if (
             isinstance(from_user_id, str)
             and from_user_id
-            and "fromUser" not in message
-            and from_user_id in self._chat_user_cache
+            and "fromUser" not in event_data
+            and (from_user := self._chat_user_cache.get(from_user_id)) is not None
         ):
-            message["fromUser"] = self._chat_user_cache[from_user_id]
+            message = dict(event_data)
+            message["fromUser"] = from_user
         channel_id = message.get("streamingChannelId")
         msg_id = message.get("id")
         if (
@@ -284,7 +305,7 @@ class _StreamingEventsMixin:
             and isinstance(msg_id, str)
             and msg_id
         ):
-            await self._send_channel_message(channel_id, "read", {"id": msg_id})
+            self._schedule_chat_read(channel_id, msg_id)
             self._refresh_chat_channel_timer(channel_id)
         await self._call_handlers("message", message)
 
@@ -330,6 +351,26 @@ class _StreamingEventsMixin:
             self._chat_channel_other_ids.pop(channel_id, None)
             self._chat_channel_tasks.pop(channel_id, None)
 
+    def _schedule_chat_read(self, channel_id: str, msg_id: str) -> None:
+        self._pending_reads[channel_id] = msg_id
+        task = self._read_flush_tasks.get(channel_id)
+        if task is None or task.done():
+            self._read_flush_tasks[channel_id] = asyncio.create_task(
+                self._flush_chat_read_later(channel_id),
+                name=f"chatUser-read-{channel_id}",
+            )
+
+    async def _flush_chat_read_later(self, channel_id: str) -> None:
+        try:
+            await asyncio.sleep(STREAM_READ_FLUSH_DELAY)
+            self._read_flush_tasks.pop(channel_id, None)
+            if msg_id := self._pending_reads.pop(channel_id, None):
+                await self._send_channel_message(channel_id, "read", {"id": msg_id})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Failed to mark chat read on {channel_id}: {e}")
+
     def _refresh_chat_channel_timer(self, channel_id: str) -> None:
         other_id = self._chat_channel_other_ids.get(channel_id)
         if not other_id:
@@ -347,6 +388,9 @@ class _StreamingEventsMixin:
         self._chat_user_channel_ids.clear()
         self._chat_channel_other_ids.clear()
         self._chat_user_cache.clear()
+        tasks.extend(self._read_flush_tasks.values())
+        self._read_flush_tasks.clear()
+        self._pending_reads.clear()
         for task in tasks:
             task.cancel()
 
@@ -354,7 +398,7 @@ class _StreamingEventsMixin:
         self, channel_name: str, event_type: str, event_data: dict[str, Any]
     ) -> None:
         if event_type != "note":
-            logger.debug(f"Unknown {channel_name} channel event type: {event_type}")
+            logger.debug("Unknown {} channel event type: {}", channel_name, event_type)
             maybe_log_event_dump(
                 self.log_dump_events, kind=event_type, payload=event_data
             )
@@ -362,51 +406,100 @@ class _StreamingEventsMixin:
         payload = event_data.get("body")
         if not isinstance(payload, dict):
             payload = event_data
-        else:
+        if "streamingChannel" not in payload:
             payload = dict(payload)
-        if isinstance(payload, dict) and "streamingChannel" not in payload:
             payload["streamingChannel"] = channel_name
-        logger.debug(f"Received {channel_name} note")
-        if channel_name == ChannelType.ANTENNA.value:
-            logger.debug(f"Antenna note received: {payload.get('id', 'unknown')}")
+        logger.debug("Received {} note", channel_name)
+        if channel_name == _ANTENNA:
+            logger.opt(lazy=True).debug(
+                "Antenna note received: {}", lambda: payload.get("id", "unknown")
+            )
         maybe_log_event_dump(self.log_dump_events, kind=channel_name, payload=payload)
         await self._call_handlers("note", payload)
 
     async def _call_handlers(self, event_type: str, data: dict[str, Any]) -> None:
-        handlers = self.event_handlers.get(event_type, [])
-        for handler in handlers:
-            try:
-                if inspect.iscoroutinefunction(handler):
-                    await handler(data)
-                else:
-                    handler(data)
-            except asyncio.CancelledError:
-                raise
-            except Exception as e:
-                logger.exception(f"Event handler failed ({event_type}): {e}")
+        handlers = self.event_handlers.get(event_type, ())
+        pending = ()
+        for index, (is_async, handler) in enumerate(handlers):
+            if is_async:
+                pending = handlers[index:]
+                break
+            self._run_sync_handler(event_type, handler, data)
+        if len(pending) == 1:
+            await self._run_handler(event_type, pending[0][1], data)
+        elif pending:
+            async with asyncio.TaskGroup() as tg:
+                for is_async, handler in pending:
+                    if is_async:
+                        coro = self._run_handler_bounded(event_type, handler, data)
+                    else:
+                        coro = self._run_sync_handler_task(event_type, handler, data)
+                    tg.create_task(coro)
 
-    def _is_duplicate_event(self, event_id: str | None, event_type: str | None) -> bool:
-        dedup_key = self._event_dedup_key(event_id, event_type)
+    @staticmethod
+    def _run_sync_handler(
+        event_type: str, handler: Callable, data: dict[str, Any]
+    ) -> None:
+        try:
+            handler(data)
+        except Exception as e:
+            logger.exception(f"Event handler failed ({event_type}): {e}")
+
+    async def _run_sync_handler_task(
+        self, event_type: str, handler: Callable, data: dict[str, Any]
+    ) -> None:
+        self._run_sync_handler(event_type, handler, data)
+
+    async def _run_handler_bounded(
+        self, event_type: str, handler: Callable, data: dict[str, Any]
+    ) -> None:
+        async with self._handler_semaphore:
+            await self._run_handler(event_type, handler, data)
+
+    @staticmethod
+    async def _run_handler(
+        event_type: str, handler: Callable, data: dict[str, Any]
+    ) -> None:
+        try:
+            await handler(data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Event handler failed ({event_type}): {e}")
+
+    def _is_duplicate_event(
+        self, dedup_key: DedupKey | None, event_id: str | None, event_type: str | None
+    ) -> bool:
         if dedup_key and dedup_key in self.processed_events:
             logger.debug(
-                f"Duplicate event detected; skipping - {event_type}, event_id={event_id}"
+                "Duplicate event detected; skipping - {}, event_id={}",
+                event_type,
+                event_id,
             )
             return True
         return False
 
-    def _track_event(self, event_id: str | None, event_type: str | None) -> None:
-        self._track_dedup_key(self._event_dedup_key(event_id, event_type))
-
-    def _track_dedup_key(self, dedup_key: str | None) -> None:
+    def _track_dedup_key(self, dedup_key: DedupKey | None) -> None:
         if dedup_key:
-            self.processed_events[dedup_key] = True
+            self.processed_events.add(dedup_key)
 
     @staticmethod
-    def _event_dedup_key(event_id: str | None, event_type: str | None) -> str | None:
+    def _event_dedup_key(
+        event_id: str | None, event_type: str | None
+    ) -> DedupKey | None:
         if not event_id:
             return None
         if not event_type:
-            return event_id
-        if event_type in {"newChatMessage", "message"}:
-            return f"chatMessage:{event_id}"
-        return f"{event_type}:{event_id}"
+            return (event_id,)
+        if event_type in _CHAT_MESSAGE_TYPES:
+            return (_CHAT_DEDUP_TYPE, event_id)
+        return (event_type, event_id)
+
+
+_MAIN_NORMALIZERS: dict[str, Callable[[dict[str, Any]], tuple[str, dict[str, Any]]]] = {
+    "mention": partial(_StreamingEventsMixin._wrap_note_event, "mention"),
+    "reply": partial(_StreamingEventsMixin._wrap_note_event, "reply"),
+    "newChatMessage": _StreamingEventsMixin._wrap_new_chat_message,
+    "notification": _StreamingEventsMixin._wrap_notification,
+    "unreadNotification": _StreamingEventsMixin._wrap_notification,
+}
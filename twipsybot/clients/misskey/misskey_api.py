@@ -308,6 +308,10 @@ class MisskeyAPI:
     async def get_current_user(self) -> dict[str, Any]:
         return await self.make_request("i", {})
 
+    def invalidate_antennas_cache(self) -> None:
+        self._antennas_cache = []
+        self._antennas_cache_expires_at = 0.0
+
     async def list_antennas(self) -> list[dict[str, Any]]:
         now = time.monotonic()
         if now < self._antennas_cache_expires_at and self._antennas_cache:
@@ -1,66 +1,123 @@
 import asyncio
 import json
+import random
+from collections import deque
 from typing import Any
 from urllib.parse import urlencode, urlsplit, urlunsplit
 
 import aiohttp
 from loguru import logger
 
-from ...shared.constants import STREAM_QUEUE_MAX
+from ...shared.codec import json_dumps, json_loads
+from ...shared.constants import (
+    STREAM_QUEUE_MAX,
+    STREAM_RECONNECT_BASE_DELAY,
+    STREAM_RECONNECT_MAX_DELAY,
+)
 from ...shared.exceptions import WebSocketConnectionError, WebSocketReconnectError
 from ...shared.utils import redact_misskey_access_token
 
 __all__ = ("_StreamingSocketMixin",)
 
+_WS_TEXT = aiohttp.WSMsgType.TEXT
+_WS_CLOSE_TYPES = frozenset(
+    (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.ERROR)
+)
+
 
 class _StreamingSocketMixin:
     @property
     def _ws_available(self) -> bool:
         return self.ws_connection is not None and not self.ws_connection.closed
 
-    def _buffer_outgoing(self, message: dict[str, Any]) -> None:
-        if len(self._send_buffer) >= STREAM_QUEUE_MAX:
-            self._send_buffer.popleft()
-        self._send_buffer.append(message)
+    def _redact_error(self, e: BaseException) -> str:
+        text = redact_misskey_access_token(str(e))
+        token = self.access_token
+        if token and token in text:
+            text = text.replace(token, "***")
+        return text
+
+    def _buffer_outgoing(self, encoded: str) -> None:
+        self._send_buffer.append(encoded)
 
     async def _send_or_buffer(self, message: dict[str, Any]) -> None:
+        encoded = json_dumps(message)
+        ws = self.ws_connection
+        if ws is None or ws.closed:
+            self._buffer_outgoing(encoded)
+            return
         async with self._send_lock:
             ws = self.ws_connection
             if ws is None or ws.closed:
-                self._buffer_outgoing(message)
+                self._buffer_outgoing(encoded)
                 return
             try:
-                await ws.send_json(message)
+                await ws.send_str(encoded)
             except (aiohttp.ClientError, OSError) as e:
-                self._buffer_outgoing(message)
+                self._buffer_outgoing(encoded)
                 await self._close_websocket()
-                error_msg = redact_misskey_access_token(str(e))
+                error_msg = self._redact_error(e)
                 logger.debug(f"WebSocket send failed; reconnecting: {error_msg}")
 
     async def _send_control(self, message: dict[str, Any]) -> None:
+        encoded = json_dumps(message)
         async with self._send_lock:
             ws = self.ws_connection
             if ws is None or ws.closed:
                 raise WebSocketReconnectError()
             try:
-                await ws.send_json(message)
+                await ws.send_str(encoded)
             except (aiohttp.ClientError, OSError) as e:
                 await self._close_websocket()
-                error_msg = redact_misskey_access_token(str(e))
+                error_msg = self._redact_error(e)
+                logger.debug(f"WebSocket send failed; reconnecting: {error_msg}")
+                raise WebSocketReconnectError() from e
+
+    async def _send_controls(self, messages: deque[str]) -> None:
+        async with self._send_lock:
+            ws = self.ws_connection
+            if ws is None or ws.closed:
+                raise WebSocketReconnectError()
+            try:
+                while messages:
+                    await ws.send_str(messages[0])
+                    messages.popleft()
+            except (aiohttp.ClientError, OSError) as e:
+                await self._close_websocket()
+                error_msg = self._redact_error(e)
                 logger.debug(f"WebSocket send failed; reconnecting: {error_msg}")
                 raise WebSocketReconnectError() from e
 
     async def _flush_send_buffer(self) -> None:
-        while self._send_buffer and self._ws_available:
-            message = self._send_buffer.popleft()
-            await self._send_control(message)
+        if not self._send_buffer or not self._ws_available:
+            return
+        pending = self._send_buffer
+        self._send_buffer = deque(maxlen=STREAM_QUEUE_MAX)
+        try:
+            await self._send_controls(pending)
+        except WebSocketReconnectError:
+            pending.extend(self._send_buffer)
+            self._send_buffer = pending
+            raise
 
-    async def _reconnect_with_backoff(self, delay_seconds: float) -> None:
+    def _next_reconnect_delay(self) -> float:
+        upper = min(
+            STREAM_RECONNECT_MAX_DELAY,
+            STREAM_RECONNECT_BASE_DELAY * (1 << self._retry_count),
+        )
+        if upper < STREAM_RECONNECT_MAX_DELAY:
+            self._retry_count += 1
+        return random.uniform(STREAM_RECONNECT_BASE_DELAY, upper)
+
+    async def _reconnect_with_backoff(self) -> None:
+        delay = self._next_reconnect_delay()
+        logger.debug(f"WebSocket disconnected; reconnecting in {delay:.1f}s")
         await self._close_websocket()
-        await asyncio.sleep(delay_seconds)
+        await asyncio.sleep(delay)
         await self._connect_websocket()
         await self._resubscribe_channels()
         await self._flush_send_buffer()
+        self._retry_count = 0
         self.state = "connected"
 
     async def _connect_websocket(self) -> None:
@@ -82,7 +139,11 @@ class _StreamingSocketMixin:
                     if getattr(self, "_connect_task", None) is task:
                         self._connect_task = None
 
-    async def _connect_websocket_inner(self) -> None:
+    def _streaming_urls(self) -> tuple[str, str]:
+        key = (self.instance_url, self.access_token)
+        cached = self._ws_url_cache
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
         raw = self.instance_url.strip().rstrip("/")
         if "://" not in raw:
             raw = f"https://{raw}"
@@ -97,6 +158,11 @@ class _StreamingSocketMixin:
         qs = urlencode({"i": self.access_token})
         ws_url = f"{base_ws_url}/streaming?{qs}"
         safe_url = f"{base_ws_url}/streaming"
+        self._ws_url_cache = (key, ws_url, safe_url)
+        return ws_url, safe_url
+
+    async def _connect_websocket_inner(self) -> None:
+        ws_url, safe_url = self._streaming_urls()
         try:
             ws = await self.transport.ws_connect(ws_url)
             async with self._ws_lock:
@@ -110,28 +176,28 @@ class _StreamingSocketMixin:
             logger.debug(f"WebSocket connected: {safe_url}")
         except (aiohttp.ClientError, OSError) as e:
             await self._cleanup_failed_connection()
-            error_msg = redact_misskey_access_token(str(e))
+            error_msg = self._redact_error(e)
             logger.error(f"WebSocket connection failed: {error_msg}")
             raise WebSocketConnectionError() from e
 
     async def _listen_messages(self) -> None:
+        ws = self.ws_connection
+        if ws is None:
+            raise WebSocketReconnectError()
+        receive = ws.receive
+        process = self._process_message
+        loads = json_loads
+        text_type = _WS_TEXT
+        close_types = _WS_CLOSE_TYPES
         while self.running:
-            ws = self.ws_connection
-            if ws is None or ws.closed:
+            if ws.closed:
                 raise WebSocketReconnectError()
             try:
-                msg = await asyncio.wait_for(ws.receive(), timeout=10)
-                if msg.type in (
-                    aiohttp.WSMsgType.CLOSED,
-                    aiohttp.WSMsgType.CLOSING,
-                    aiohttp.WSMsgType.ERROR,
-                ):
+                msg_type, payload, _ = await receive()
+                if msg_type is text_type:
+                    await process(loads(payload), payload)
+                elif msg_type in close_types:
                     raise WebSocketReconnectError()
-                if msg.type == aiohttp.WSMsgType.TEXT:
-                    data = json.loads(msg.data)
-                    await self._process_message(data, msg.data)
-            except TimeoutError:
-                continue
             except (
                 aiohttp.ClientError,
                 json.JSONDecodeError,
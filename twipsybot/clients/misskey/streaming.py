@@ -1,18 +1,22 @@
 import asyncio
+import inspect
 import uuid
 from collections import deque
 from collections.abc import Awaitable, Callable
 from typing import Any
 
 import aiohttp
-from cachetools import TTLCache
+from cachetools import LRUCache
 from loguru import logger
 
+from ...shared.cache import RotatingKeySet
+from ...shared.codec import json_dumps
 from ...shared.constants import (
+    CHAT_USER_CACHE_MAX,
     STREAM_DEDUP_CACHE_MAX,
     STREAM_DEDUP_CACHE_TTL,
+    STREAM_HANDLER_CONCURRENCY,
     STREAM_QUEUE_MAX,
-    STREAM_QUEUE_PUT_TIMEOUT,
     STREAM_WORKERS,
 )
 from ...shared.exceptions import WebSocketConnectionError
@@ -40,15 +44,13 @@ class StreamingClient(_StreamingSocketMixin, _StreamingEventsMixin):
         self.log_dump_events = log_dump_events
         self.state = "initializing"
         self.channels: dict[str, dict[str, Any]] = {}
-        self.event_handlers: dict[str, list[Callable]] = {}
-        self.processed_events = TTLCache(
+        self.event_handlers: dict[str, list[tuple[bool, Callable]]] = {}
+        self.processed_events = RotatingKeySet(
             maxsize=STREAM_DEDUP_CACHE_MAX, ttl=STREAM_DEDUP_CACHE_TTL
         )
-        self._event_queue: asyncio.Queue[tuple[str, dict[str, Any]] | None] = (
-            asyncio.Queue(maxsize=STREAM_QUEUE_MAX)
-        )
+        self._event_buffer: deque[tuple[str, dict[str, Any]] | None] = deque()
+        self._event_ready = asyncio.Event()
         self._worker_count = STREAM_WORKERS
-        self._queue_put_timeout = STREAM_QUEUE_PUT_TIMEOUT
         self._workers: list[asyncio.Task[None]] = []
         self.running = False
         self.should_reconnect = True
@@ -56,12 +58,20 @@ class StreamingClient(_StreamingSocketMixin, _StreamingEventsMixin):
         self._chat_channel_tasks: dict[str, asyncio.Task[None]] = {}
         self._chat_user_channel_ids: dict[str, str] = {}
         self._chat_channel_other_ids: dict[str, str] = {}
-        self._chat_user_cache: dict[str, dict[str, Any]] = {}
-        self._send_buffer: deque[dict[str, Any]] = deque()
+        self._chat_user_cache: LRUCache[str, dict[str, Any]] = LRUCache(
+            maxsize=CHAT_USER_CACHE_MAX
+        )
+        self._pending_reads: dict[str, str] = {}
+        self._read_flush_tasks: dict[str, asyncio.Task[None]] = {}
+        self._send_buffer: deque[str] = deque(maxlen=STREAM_QUEUE_MAX)
         self._ws_lock = asyncio.Lock()
         self._send_lock = asyncio.Lock()
         self._lifecycle_lock = asyncio.Lock()
         self._connect_task: asyncio.Task[None] | None = None
+        self._ws_url_cache: tuple[tuple[str, str], str, str] | None = None
+        self._retry_count = 0
+        self._channel_dispatch = self._build_channel_dispatch()
+        self._handler_semaphore = asyncio.Semaphore(STREAM_HANDLER_CONCURRENCY)
 
     async def __aenter__(self):
         return self
@@ -94,7 +104,9 @@ class StreamingClient(_StreamingSocketMixin, _StreamingEventsMixin):
         self._add_event_handler("notification", handler)
 
     def _add_event_handler(self, event_type: str, handler: Callable) -> None:
-        self.event_handlers.setdefault(event_type, []).append(handler)
+        self.event_handlers.setdefault(event_type, []).append(
+            (inspect.iscoroutinefunction(handler), handler)
+        )
 
     @staticmethod
     def _channel_name(spec: ChannelSpec) -> str:
@@ -112,7 +124,6 @@ class StreamingClient(_StreamingSocketMixin, _StreamingEventsMixin):
         self.should_reconnect = reconnect
         specs = self._normalize_channel_specs(channels)
         await self.connect_once(specs)
-        retry_delay = 1.0
         while self.should_reconnect and self.running:
             try:
                 await self._listen_messages()
@@ -121,12 +132,10 @@ class StreamingClient(_StreamingSocketMixin, _StreamingEventsMixin):
                 if not reconnect:
                     raise
                 self.state = "reconnecting"
-                logger.debug(f"WebSocket disconnected; reconnecting in {retry_delay}s")
                 try:
-                    await self._reconnect_with_backoff(retry_delay)
-                    retry_delay = 1.0
+                    await self._reconnect_with_backoff()
                 except WebSocketConnectionError:
-                    retry_delay = min(retry_delay * 2, 30.0)
+                    pass
 
     async def disconnect(self) -> None:
         async with self._lifecycle_lock:
@@ -270,21 +279,26 @@ class StreamingClient(_StreamingSocketMixin, _StreamingEventsMixin):
                 self._first_connection = False
 
     async def _resubscribe_channels(self) -> None:
+        messages: deque[str] = deque()
         for channel_id, info in self.channels.items():
             channel_name = info.get("name")
             if not isinstance(channel_name, str) or not channel_name:
                 continue
             params = info.get("params") or {}
-            await self._send_control(
-                {
-                    "type": "connect",
-                    "body": {
-                        "channel": channel_name,
-                        "id": channel_id,
-                        "params": params,
-                    },
-                }
+            messages.append(
+                json_dumps(
+                    {
+                        "type": "connect",
+                        "body": {
+                            "channel": channel_name,
+                            "id": channel_id,
+                            "params": params,
+                        },
+                    }
+                )
             )
+        if messages:
+            await self._send_controls(messages)
 
     async def _disconnect_all_channels(self) -> None:
         for channel_id in self.channels:
@@ -301,11 +315,11 @@ class StreamingClient(_StreamingSocketMixin, _StreamingEventsMixin):
         self, data: dict[str, Any], raw_message: str | None = None
     ) -> None:
         if not data or not isinstance(data, dict):
-            logger.debug(f"Invalid message format; skipping: {raw_message}")
+            logger.debug("Invalid message format; skipping: {}", raw_message)
             return
         message_type = data.get("type")
-        body = data.get("body", {})
         if message_type == "channel":
-            await self._handle_channel_message(body)
+            body = data.get("body")
+            await self._handle_channel_message(body if isinstance(body, dict) else {})
         else:
-            logger.debug(f"Unknown message type received: {message_type}")
+            logger.debug("Unknown message type received: {}", message_type)
@@ -3,7 +3,7 @@ import asyncio
 import aiohttp
 from loguru import logger
 
-from ...shared.constants import API_TIMEOUT
+from ...shared.constants import API_TIMEOUT, STREAM_HEARTBEAT
 from ...shared.exceptions import ClientConnectorError
 
 __all__ = ("TCPClient",)
@@ -56,7 +56,7 @@ class TCPClient:
 
     async def ws_connect(self, url: str) -> aiohttp.ClientWebSocketResponse:
         try:
-            return await self.session.ws_connect(url)
+            return await self.session.ws_connect(url, heartbeat=STREAM_HEARTBEAT)
         except aiohttp.ClientConnectorError as e:
             logger.error(f"TCP client connection failed: {e}")
             raise ClientConnectorError() from e
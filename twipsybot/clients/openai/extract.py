@@ -1,8 +1,10 @@
-import json
 from typing import Any
 
+from cachetools import LRUCache
 from loguru import logger
 
+from ...shared.codec import json_loads
+from ...shared.constants import STRUCTURED_FORMAT_CACHE_MAX
 from ...shared.exceptions import APIConnectionError
 
 
@@ -18,26 +20,22 @@ def extract_responses_text(response: Any) -> str:
 def collect_responses_output_text(output: Any) -> list[str]:
     if not isinstance(output, list):
         raise APIConnectionError("Invalid output type")
-    return list(iter_responses_output_text(output))
-
-
-def iter_responses_output_text(output: list[Any]):
+    parts: list[str] = []
+    append = parts.append
     for item in output:
         if getattr(item, "type", None) != "message":
             continue
-        yield from iter_responses_message_content(getattr(item, "content", None))
-
-
-def iter_responses_message_content(content: Any):
-    if not isinstance(content, list):
-        return
-    for c in content:
-        if (
-            getattr(c, "type", None) == "output_text"
-            and isinstance((t := getattr(c, "text", None)), str)
-            and t
-        ):
-            yield t
+        content = getattr(item, "content", None)
+        if not isinstance(content, list):
+            continue
+        for c in content:
+            if (
+                getattr(c, "type", None) == "output_text"
+                and isinstance((t := getattr(c, "text", None)), str)
+                and t
+            ):
+                append(t)
+    return parts
 
 
 def process_chat_completions_response(response: Any, call_type: str) -> str:
@@ -45,27 +43,40 @@ def process_chat_completions_response(response: Any, call_type: str) -> str:
     if not generated_text:
         raise APIConnectionError()
     logger.debug(
-        f"OpenAI API {call_type} call succeeded; output length: {len(generated_text)}"
+        "OpenAI API {} call succeeded; output length: {}",
+        call_type,
+        len(generated_text),
     )
     return generated_text
 
 
+_JSON_BRACKETS = {"{": "}", "[": "]"}
+
+
 def coerce_json_substring(text: str) -> str | None:
     s = text.strip()
     if not s:
         return None
     for open_ch, close_ch in (("{", "}"), ("[", "]")):
         i = s.find(open_ch)
-        j = s.rfind(close_ch)
-        if 0 <= i < j:
+        if i < 0:
+            continue
+        j = s.rfind(close_ch, i + 1)
+        if j > i:
             return s[i : j + 1]
     return None
 
 
 def parse_json(text: str) -> Any:
-    if (sub := coerce_json_substring(text)) is None:
+    s = text.strip()
+    if s and _JSON_BRACKETS.get(s[0]) == s[-1]:
+        try:
+            return json_loads(s)
+        except ValueError:
+            pass
+    if (sub := coerce_json_substring(s)) is None:
         raise ValueError()
-    return json.loads(sub)
+    return json_loads(sub)
 
 
 def validate_structured_output(
@@ -79,23 +90,47 @@ def validate_structured_output(
     if required_keys:
         if not isinstance(obj, dict):
             raise ValueError()
-        missing = [k for k in required_keys if k not in obj]
-        if missing:
-            raise ValueError()
+        for key in required_keys:
+            if key not in obj:
+                raise ValueError()
     return obj
 
 
+def parse_structured_output(
+    text: str,
+    *,
+    expected_type: type | tuple[type, ...] | None,
+    required_keys: tuple[str, ...] | None,
+) -> Any:
+    return validate_structured_output(
+        parse_json(text), expected_type=expected_type, required_keys=required_keys
+    )
+
+
+_JSON_OBJECT_FORMAT: dict[str, Any] = {"type": "json_object"}
+
+_structured_formats: LRUCache[
+    tuple[int, str, bool],
+    tuple[dict[str, Any], dict[str, Any], dict[str, Any]],
+] = LRUCache(maxsize=STRUCTURED_FORMAT_CACHE_MAX)
+
+
 def build_structured_formats(
     schema: dict[str, Any] | None,
     *,
     name: str,
     strict: bool,
 ) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
-    if schema:
-        rf = {
-            "type": "json_schema",
-            "json_schema": {"name": name, "schema": schema, "strict": strict},
-        }
-        tf = {"type": "json_schema", "name": name, "schema": schema, "strict": strict}
-        return rf, tf
-    return {"type": "json_object"}, {"type": "json_object"}
+    if not schema:
+        return _JSON_OBJECT_FORMAT, _JSON_OBJECT_FORMAT
+    key = (id(schema), name, strict)
+    cached = _structured_formats.get(key)
+    if cached is not None and cached[0] is schema:
+        return cached[1], cached[2]
+    rf = {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema, "strict": strict},
+    }
+    tf = {"type": "json_schema", "name": name, "schema": schema, "strict": strict}
+    _structured_formats[key] = (schema, rf, tf)
+    return rf, tf
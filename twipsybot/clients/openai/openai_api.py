@@ -30,11 +30,11 @@ from ...shared.utils import retry_async
 from .extract import (
     build_structured_formats,
     extract_responses_text,
-    parse_json,
+    parse_structured_output,
     process_chat_completions_response,
-    validate_structured_output,
 )
 from .requests import (
+    chat_max_tokens_key,
     make_chat_completions_request,
     make_responses_request,
     should_use_responses,
@@ -42,6 +42,11 @@ from .requests import (
 
 __all__ = ("OpenAIAPI",)
 
+_REPAIR_PREFIX = (
+    "Output a single valid JSON only. No Markdown. No explanations.\nPrevious output: "
+)
+_REPAIR_SUFFIX = "\nFix it into valid JSON:"
+
 
 class OpenAIAPI:
     @staticmethod
@@ -66,11 +71,16 @@ class OpenAIAPI:
         self.model = model or "gpt-5-mini"
         self.api_base = (api_base or "https://api.openai.com/v1").strip().strip("`")
         self.api_mode = (api_mode or "auto").strip().lower()
+        self._max_tokens_key = chat_max_tokens_key(self.api_base)
         self._responses_disabled = False
+        self._select_call_paths()
         self._semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
         try:
             self.client = openai.AsyncOpenAI(
-                api_key=self.api_key, base_url=self.api_base, timeout=API_TIMEOUT
+                api_key=self.api_key,
+                base_url=self.api_base,
+                timeout=API_TIMEOUT,
+                max_retries=0,
             )
             self._initialized = False
         except Exception as e:
@@ -106,7 +116,7 @@ class OpenAIAPI:
                 client=self.client,
                 semaphore=self._semaphore,
                 model=self.model,
-                api_base=self.api_base,
+                max_tokens_key=self._max_tokens_key,
                 messages=messages,
                 max_tokens=max_tokens,
                 temperature=temperature,
@@ -128,17 +138,25 @@ class OpenAIAPI:
             return False
         return should_use_responses(api_mode=self.api_mode, api_base=self.api_base)
 
-    async def _call_api(
+    def _select_call_paths(self) -> None:
+        if self._should_use_responses():
+            self._call_api = self._call_responses
+            self._call_api_structured = self._call_responses_structured
+        else:
+            self._call_api = self._call_api_common
+            self._call_api_structured = self._call_chat_structured
+
+    def _disable_responses(self) -> None:
+        self._responses_disabled = True
+        self._select_call_paths()
+
+    async def _call_responses(
         self,
         messages: list[dict[str, Any]],
         max_tokens: int | None,
         temperature: float | None,
         call_type: str,
     ) -> str:
-        if not self._should_use_responses():
-            return await self._call_api_common(
-                messages, max_tokens, temperature, call_type
-            )
         try:
             response = await make_responses_request(
                 client=self.client,
@@ -150,14 +168,16 @@ class OpenAIAPI:
             )
             text = extract_responses_text(response)
             logger.debug(
-                f"OpenAI API {call_type} call succeeded; output length: {len(text)}"
+                "OpenAI API {} call succeeded; output length: {}",
+                call_type,
+                len(text),
             )
             return text
         except OpenAIAuthenticationError as e:
             logger.error(f"API authentication failed: {e}")
             raise AuthenticationError(self._safe_error_message(e)) from e
         except (NotFoundError, BadRequestError) as e:
-            self._responses_disabled = True
+            self._disable_responses()
             logger.warning(
                 f"Responses API unavailable; falling back to Chat Completions: {e}"
             )
@@ -168,7 +188,25 @@ class OpenAIAPI:
             logger.error(f"Invalid API response format: {e}")
             raise ValueError(self._safe_error_message(e)) from e
 
-    async def _call_api_structured(
+    async def _call_chat_structured(
+        self,
+        messages: list[dict[str, Any]],
+        max_tokens: int | None,
+        temperature: float | None,
+        call_type: str,
+        *,
+        response_format: dict[str, Any] | None,
+        text_format: dict[str, Any] | None,
+    ) -> str:
+        return await self._call_api_common(
+            messages,
+            max_tokens,
+            temperature,
+            call_type,
+            response_format=response_format,
+        )
+
+    async def _call_responses_structured(
         self,
         messages: list[dict[str, Any]],
         max_tokens: int | None,
@@ -178,14 +216,6 @@ class OpenAIAPI:
         response_format: dict[str, Any] | None,
         text_format: dict[str, Any] | None,
     ) -> str:
-        if not self._should_use_responses():
-            return await self._call_api_common(
-                messages,
-                max_tokens,
-                temperature,
-                call_type,
-                response_format=response_format,
-            )
         try:
             response = await make_responses_request(
                 client=self.client,
@@ -198,14 +228,16 @@ class OpenAIAPI:
             )
             text = extract_responses_text(response)
             logger.debug(
-                f"OpenAI API {call_type} call succeeded; output length: {len(text)}"
+                "OpenAI API {} call succeeded; output length: {}",
+                call_type,
+                len(text),
             )
             return text
         except OpenAIAuthenticationError as e:
             logger.error(f"API authentication failed: {e}")
             raise AuthenticationError(self._safe_error_message(e)) from e
         except (NotFoundError, BadRequestError) as e:
-            self._responses_disabled = True
+            self._disable_responses()
             logger.warning(
                 f"Responses API unavailable; falling back to Chat Completions: {e}"
             )
@@ -273,14 +305,15 @@ class OpenAIAPI:
         rf, tf = build_structured_formats(schema, name=name, strict=strict)
         messages = self._build_messages(prompt, system_prompt)
         last_text = ""
+        repair: dict[str, Any] | None = None
         for attempt in range(max_attempts):
             if attempt:
-                repair = (
-                    "Output a single valid JSON only. No Markdown. No explanations.\n"
-                    f"Previous output: {last_text}\n"
-                    "Fix it into valid JSON:"
-                )
-                messages = [{"role": "user", "content": repair}]
+                content = f"{_REPAIR_PREFIX}{last_text}{_REPAIR_SUFFIX}"
+                if repair is None:
+                    repair = {"role": "user", "content": content}
+                    messages = [repair]
+                else:
+                    repair["content"] = content
             last_text = await self._call_api_structured(
                 messages,
                 max_tokens,
@@ -290,9 +323,8 @@ class OpenAIAPI:
                 text_format=tf,
             )
             try:
-                obj = parse_json(last_text)
-                return validate_structured_output(
-                    obj, expected_type=expected_type, required_keys=required_keys
+                return parse_structured_output(
+                    last_text, expected_type=expected_type, required_keys=required_keys
                 )
             except ValueError:
                 continue
@@ -4,7 +4,12 @@ from urllib.parse import urlparse
 
 import openai
 
-from ...shared.constants import REQUEST_TIMEOUT
+
+def chat_max_tokens_key(api_base: str) -> str:
+    host = urlparse(api_base).hostname
+    if host and (host == "openai.com" or host.endswith(".openai.com")):
+        return "max_completion_tokens"
+    return "max_tokens"
 
 
 def should_use_responses(*, api_mode: str, api_base: str) -> bool:
@@ -24,20 +29,17 @@ async def make_responses_request(
     temperature: float | None,
     text_format: dict[str, Any] | None = None,
 ):
+    kwargs: dict[str, Any] = {
+        "model": model,
+        "input": messages,
+        "temperature": temperature,
+    }
+    if max_tokens is not None:
+        kwargs["max_output_tokens"] = max_tokens
+    if text_format:
+        kwargs["text"] = {"format": text_format}
     async with semaphore:
-        kwargs: dict[str, Any] = {
-            "model": model,
-            "input": messages,
-            "temperature": temperature,
-        }
-        if max_tokens is not None:
-            kwargs["max_output_tokens"] = max_tokens
-        if text_format:
-            kwargs["text"] = {"format": text_format}
-        return await asyncio.wait_for(
-            client.responses.create(**kwargs),
-            timeout=REQUEST_TIMEOUT,
-        )
+        return await client.responses.create(**kwargs)
 
 
 async def make_chat_completions_request(
@@ -45,29 +47,20 @@ async def make_chat_completions_request(
     client: openai.AsyncOpenAI,
     semaphore: asyncio.Semaphore,
     model: str,
-    api_base: str,
+    max_tokens_key: str,
     messages: list[dict[str, Any]],
     max_tokens: int | None,
     temperature: float | None,
     response_format: dict[str, Any] | None = None,
 ):
+    kwargs: dict[str, Any] = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+    }
+    if max_tokens is not None:
+        kwargs[max_tokens_key] = max_tokens
+    if response_format:
+        kwargs["response_format"] = response_format
     async with semaphore:
-        kwargs: dict[str, Any] = {
-            "model": model,
-            "messages": messages,
-            "temperature": temperature,
-        }
-        if max_tokens is not None:
-            api_base_host = urlparse(api_base).hostname
-            if api_base_host and (
-                api_base_host == "openai.com" or api_base_host.endswith(".openai.com")
-            ):
-                kwargs["max_completion_tokens"] = max_tokens
-            else:
-                kwargs["max_tokens"] = max_tokens
-        if response_format:
-            kwargs["response_format"] = response_format
-        return await asyncio.wait_for(
-            client.chat.completions.create(**kwargs),
-            timeout=REQUEST_TIMEOUT,
-        )
+        return await client.chat.completions.create(**kwargs)
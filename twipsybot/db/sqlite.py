@@ -1,6 +1,7 @@
 import asyncio
+import time
+from collections import deque
 from collections.abc import Sequence
-from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -9,52 +10,143 @@ from loguru import logger
 
 from ..shared.config import Config
 from ..shared.config_keys import ConfigKeys
+from ..shared.constants import DB_POOL_WARMUP, DB_READERS
 
 __all__ = ("ConnectionPool", "DBManager")
 
 Row = Sequence[Any]
 
+_SCHEMA_VERSION = 2
+
+_SCHEMA_SCRIPT = f"""
+BEGIN;
+CREATE TABLE IF NOT EXISTS plugin_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    plugin_name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    updated_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+    UNIQUE(plugin_name, key)
+);
+CREATE TABLE IF NOT EXISTS response_limit_state (
+    user_id TEXT PRIMARY KEY,
+    last_reply_ts REAL,
+    turns INTEGER NOT NULL DEFAULT 0,
+    blocked_until_ts REAL,
+    updated_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+);
+CREATE INDEX IF NOT EXISTS idx_plugin_data_name_key ON plugin_data(plugin_name, key);
+CREATE INDEX IF NOT EXISTS idx_response_limit_state_updated ON response_limit_state(updated_at);
+UPDATE plugin_data
+    SET updated_at = CAST(strftime('%s', updated_at, 'utc') AS INTEGER)
+    WHERE typeof(updated_at) = 'text';
+UPDATE response_limit_state
+    SET updated_at = CAST(strftime('%s', updated_at, 'utc') AS INTEGER)
+    WHERE typeof(updated_at) = 'text';
+PRAGMA user_version={_SCHEMA_VERSION};
+COMMIT;
+"""
+
+_WRITER_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+"""
+
+_CONNECTION_PRAGMAS = """
+PRAGMA cache_size=10000;
+PRAGMA busy_timeout=30000;
+PRAGMA temp_store=MEMORY;
+"""
+
 
 class ConnectionPool:
-    def __init__(self, db_path: str, max_connections: int = 10):
+    def __init__(self, db_path: str, max_connections: int = 10, mmap_size: int = 0):
         self.db_path = db_path
         self.max_connections = max_connections
-        self._pool = asyncio.Queue(maxsize=max_connections)
+        self._reader_pragmas = (
+            f"{_CONNECTION_PRAGMAS}PRAGMA mmap_size={int(mmap_size)};\n"
+        )
+        self._pragmas = f"{_WRITER_PRAGMAS}{self._reader_pragmas}"
+        self._idle: deque[aiosqlite.Connection] = deque()
+        self._waiters: deque[asyncio.Future[aiosqlite.Connection]] = deque()
         self._created_connections = 0
-        self._lock = asyncio.Lock()
+        self._readers: list[aiosqlite.Connection] = []
+        self._next_reader = 0
+
+    async def _new_connection(self) -> aiosqlite.Connection:
+        self._created_connections += 1
+        conn: aiosqlite.Connection | None = None
+        try:
+            conn = await aiosqlite.connect(
+                self.db_path, timeout=30.0, isolation_level=None
+            )
+            await conn.executescript(self._pragmas)
+            return conn
+        except BaseException:
+            self._created_connections -= 1
+            if conn is not None:
+                await conn.close()
+            raise
+
+    async def open_readers(self, n: int) -> None:
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        while len(self._readers) < n:
+            conn = await aiosqlite.connect(
+                uri, uri=True, timeout=30.0, isolation_level=None
+            )
+            try:
+                await conn.executescript(self._reader_pragmas)
+            except BaseException:
+                await conn.close()
+                raise
+            self._readers.append(conn)
+
+    def reader(self) -> aiosqlite.Connection | None:
+        readers = self._readers
+        if not readers:
+            return None
+        self._next_reader = (self._next_reader + 1) % len(readers)
+        return readers[self._next_reader]
+
+    async def warmup(self, n: int) -> None:
+        missing = min(
+            n - len(self._idle), self.max_connections - self._created_connections
+        )
+        for _ in range(missing):
+            await self.return_connection(await self._new_connection())
 
     async def get_connection(self) -> aiosqlite.Connection:
+        if self._idle:
+            return self._idle.pop()
+        if self._created_connections < self.max_connections:
+            return await self._new_connection()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
         try:
-            return self._pool.get_nowait()
-        except asyncio.QueueEmpty:
-            async with self._lock:
-                if self._created_connections < self.max_connections:
-                    conn = await aiosqlite.connect(
-                        self.db_path, timeout=30.0, isolation_level=None
-                    )
-                    await conn.execute("PRAGMA journal_mode=WAL")
-                    await conn.execute("PRAGMA synchronous=NORMAL")
-                    await conn.execute("PRAGMA cache_size=10000")
-                    await conn.execute("PRAGMA busy_timeout=30000")
-                    self._created_connections += 1
-                    return conn
-            return await self._pool.get()
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                await self.return_connection(waiter.result())
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
 
     async def return_connection(self, conn: aiosqlite.Connection) -> None:
-        try:
-            self._pool.put_nowait(conn)
-        except asyncio.QueueFull:
-            await conn.close()
-            async with self._lock:
-                self._created_connections -= 1
+        waiters = self._waiters
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(conn)
+                return
+        self._idle.append(conn)
 
     async def close_all(self) -> None:
-        connections = []
-        while not self._pool.empty():
-            try:
-                connections.append(self._pool.get_nowait())
-            except asyncio.QueueEmpty:
-                break
+        connections = [*self._idle, *self._readers]
+        self._idle.clear()
+        self._readers.clear()
         for conn in connections:
             await conn.close()
         self._created_connections = 0
@@ -74,7 +166,12 @@ class DBManager:
         if not isinstance(resolved_db_path, str) or not resolved_db_path.strip():
             resolved_db_path = "data/twipsybot.db"
         self.db_path = Path(resolved_db_path)
-        self._pool = ConnectionPool(str(self.db_path), max_connections)
+        mmap_mb = self.config.get(ConfigKeys.DB_MMAP_MB)
+        if not isinstance(mmap_mb, int) or mmap_mb < 0:
+            mmap_mb = 256
+        self._pool = ConnectionPool(
+            str(self.db_path), max_connections, mmap_size=mmap_mb * 1024 * 1024
+        )
         self._initialized = False
 
     async def __aenter__(self):
@@ -89,6 +186,11 @@ class DBManager:
         if self._initialized:
             return
         await self._create_tables()
+        await self._pool.warmup(DB_POOL_WARMUP)
+        try:
+            await self._pool.open_readers(DB_READERS)
+        except (aiosqlite.Error, OSError) as e:
+            logger.warning(f"Read-only DB connections unavailable: {e}")
         self._initialized = True
         logger.info(f"DB manager initialized: {self.db_path}")
 
@@ -105,43 +207,20 @@ class DBManager:
 
     @staticmethod
     async def _execute_schema(conn: aiosqlite.Connection) -> None:
-        schema_statements = [
-            """
-            CREATE TABLE IF NOT EXISTS plugin_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                plugin_name TEXT NOT NULL,
-                key TEXT NOT NULL,
-                value TEXT,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(plugin_name, key)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS response_limit_state (
-                user_id TEXT PRIMARY KEY,
-                last_reply_ts REAL,
-                turns INTEGER NOT NULL DEFAULT 0,
-                blocked_until_ts REAL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """,
-        ]
-        index_statements = [
-            "CREATE INDEX IF NOT EXISTS idx_plugin_data_name_key ON plugin_data(plugin_name, key)",
-            "CREATE INDEX IF NOT EXISTS idx_response_limit_state_updated ON response_limit_state(updated_at)",
-        ]
-        await conn.execute("BEGIN")
+        async with conn.execute("PRAGMA user_version") as cursor:
+            row = await cursor.fetchone()
+        if row and row[0] >= _SCHEMA_VERSION:
+            return
         try:
-            for statement in schema_statements:
-                await conn.execute(statement)
-            for index_sql in index_statements:
-                await conn.execute(index_sql)
-            await conn.commit()
+            await conn.executescript(_SCHEMA_SCRIPT)
         except Exception:
             await conn.rollback()
             raise
 
     async def _fetch_one(self, query: str, params: tuple[Any, ...] = ()) -> Row | None:
+        if (reader := self._pool.reader()) is not None:
+            async with reader.execute(query, params) as cursor:
+                return await cursor.fetchone()
         conn = await self._pool.get_connection()
         try:
             async with conn.execute(query, params) as cursor:
@@ -150,6 +229,9 @@ class DBManager:
             await self._pool.return_connection(conn)
 
     async def _fetch_all(self, query: str, params: tuple[Any, ...] = ()) -> list[Row]:
+        if (reader := self._pool.reader()) is not None:
+            async with reader.execute(query, params) as cursor:
+                return list(await cursor.fetchall())
         conn = await self._pool.get_connection()
         try:
             async with conn.execute(query, params) as cursor:
@@ -164,9 +246,30 @@ class DBManager:
                 await conn.commit()
                 return cursor.rowcount
         except aiosqlite.Error as e:
-            await conn.rollback()
+            await asyncio.shield(conn.rollback())
+            logger.error(f"Database write operation failed: {e}")
+            raise
+        except BaseException:
+            await asyncio.shield(conn.rollback())
+            raise
+        finally:
+            await self._pool.return_connection(conn)
+
+    async def _execute_write_many(
+        self, query: str, params_seq: Sequence[tuple[Any, ...]]
+    ) -> None:
+        conn = await self._pool.get_connection()
+        try:
+            await conn.execute("BEGIN")
+            await conn.executemany(query, params_seq)
+            await conn.commit()
+        except aiosqlite.Error as e:
+            await asyncio.shield(conn.rollback())
             logger.error(f"Database write operation failed: {e}")
             raise
+        except BaseException:
+            await asyncio.shield(conn.rollback())
+            raise
         finally:
             await self._pool.return_connection(conn)
 
@@ -180,7 +283,18 @@ class DBManager:
     async def set_plugin_data(self, plugin_name: str, key: str, value: str) -> None:
         await self._execute_write(
             "INSERT OR REPLACE INTO plugin_data (plugin_name, key, value, updated_at) VALUES (?, ?, ?, ?)",
-            (plugin_name, key, value, datetime.now()),
+            (plugin_name, key, value, int(time.time())),
+        )
+
+    async def set_plugin_data_many(
+        self, plugin_name: str, items: Sequence[tuple[str, str]]
+    ) -> None:
+        if not items:
+            return
+        now = int(time.time())
+        await self._execute_write_many(
+            "INSERT OR REPLACE INTO plugin_data (plugin_name, key, value, updated_at) VALUES (?, ?, ?, ?)",
+            [(plugin_name, key, value, now) for key, value in items],
         )
 
     async def get_response_limit_state(
@@ -210,7 +324,25 @@ class DBManager:
                 (user_id, last_reply_ts, turns, blocked_until_ts, updated_at)
             VALUES (?, ?, ?, ?, ?)
             """,
-            (user_id, last_reply_ts, int(turns), blocked_until_ts, datetime.now()),
+            (user_id, last_reply_ts, int(turns), blocked_until_ts, int(time.time())),
+        )
+
+    async def set_response_limit_states(
+        self, states: Sequence[tuple[str, float | None, int, float | None]]
+    ) -> None:
+        if not states:
+            return
+        now = int(time.time())
+        await self._execute_write_many(
+            """
+            INSERT OR REPLACE INTO response_limit_state
+                (user_id, last_reply_ts, turns, blocked_until_ts, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                (user_id, last_reply_ts, int(turns), blocked_until_ts, now)
+                for user_id, last_reply_ts, turns, blocked_until_ts in states
+            ],
         )
 
     async def cleanup_response_limit_state(
@@ -224,9 +356,9 @@ class DBManager:
             return 0
         if max_age_days == 0:
             return await self._execute_write("DELETE FROM response_limit_state")
-        cutoff = int(datetime.now().timestamp() - (max_age_days * 86400))
+        cutoff = int(time.time()) - max_age_days * 86400
         return await self._execute_write(
-            "DELETE FROM response_limit_state WHERE CAST(strftime('%s', updated_at) AS INTEGER) < ?",
+            "DELETE FROM response_limit_state WHERE updated_at < ?",
             (cutoff,),
         )
 
@@ -242,23 +374,25 @@ class DBManager:
     async def get_table_stats(self) -> dict[str, Any]:
         tables_query = "SELECT name FROM sqlite_master WHERE type='table'"
         tables_result = await self._fetch_all(tables_query)
+        table_names = [
+            name
+            for row in tables_result
+            if row
+            and isinstance((name := row[0]), str)
+            and name.replace("_", "").isalnum()
+        ]
+        if not table_names:
+            return {}
+        stats_query = " UNION ALL ".join(
+            f'SELECT ?, (SELECT COUNT(*) FROM "{name}"), '
+            "(SELECT SUM(pgsize) FROM dbstat WHERE name = ?)"
+            for name in table_names
+        )
+        params = tuple(p for name in table_names for p in (name, name))
         table_stats: dict[str, Any] = {}
-        for table_row in tables_result:
-            table_name = table_row[0] if table_row else None
-            if not isinstance(table_name, str):
-                continue
-            if not table_name.replace("_", "").isalnum():
-                continue
-            count_query = f'SELECT COUNT(*) FROM "{table_name}"'
-            count_result = await self._fetch_one(count_query)
-            size_query = "SELECT SUM(pgsize) FROM dbstat WHERE name = ?"
-            size_result = await self._fetch_one(size_query, (table_name,))
-            size_bytes = 0
-            if size_result and size_result[0]:
-                size_bytes = int(size_result[0])
-            row_count = 0
-            if count_result and count_result[0] is not None:
-                row_count = int(count_result[0])
+        for table_name, count, size in await self._fetch_all(stats_query, params):
+            size_bytes = int(size) if size else 0
+            row_count = int(count) if count is not None else 0
             table_stats[table_name] = {
                 "row_count": row_count,
                 "size_bytes": size_bytes,
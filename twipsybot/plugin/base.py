@@ -8,6 +8,8 @@ from .context import PluginContext
 
 __all__ = ("PluginBase", "PluginHookResult")
 
+_CONTEXT_RESERVED = frozenset(("name", "config"))
+
 
 class PluginHookResult(TypedDict, total=False):
     handled: bool
@@ -30,12 +32,9 @@ class PluginBase:
             context = config_or_context
             self.config = context.config
             self.name = context.name
-            for attr_name in dir(context):
-                if not attr_name.startswith("_") and attr_name not in (
-                    "name",
-                    "config",
-                ):
-                    setattr(self, attr_name, getattr(context, attr_name))
+            for attr_name, value in vars(context).items():
+                if attr_name not in _CONTEXT_RESERVED and not attr_name.startswith("_"):
+                    setattr(self, attr_name, value)
         else:
             self.config = config_or_context
             self.name = self.__class__.__name__
@@ -1,14 +1,17 @@
 import asyncio
+import functools
 import importlib.util
 import inspect
+import itertools
 import re
 import sys
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
-import yaml
 from loguru import logger
 
+from ..shared.codec import yaml_load
 from ..shared.config import Config
 from .base import PluginBase
 from .context import PluginContext
@@ -17,6 +20,19 @@ __all__ = ("PluginManager",)
 
 _PLUGIN_CONFIG_FILENAME = "config.yaml"
 _PLUGIN_HOOK_TIMEOUT_SECONDS = 60.0
+_HANDLING_HOOKS = frozenset(("on_message", "on_mention"))
+_CAMELIZE_SPLIT_RE = re.compile(r"[^a-zA-Z0-9]+")
+_ENABLED_LINE_RE = re.compile(rb"^[ \t]*[\"']?enabled\b", re.M)
+_PRIORITY_KEY_RE = re.compile(rb"^[ \t]*[\"']?priority\b", re.M)
+_PRIORITY_LINE_RE = re.compile(
+    rb"^priority[ \t]*:[ \t]*(-?\d+)[ \t]*(?:#.*)?\r?$", re.M
+)
+_DISABLED_LINE_RE = re.compile(
+    rb"^enabled[ \t]*:[ \t]*(?:false|False|FALSE|no|No|NO|off|Off|OFF)[ \t]*(?:#.*)?\r?$",
+    re.M,
+)
+
+_HookTarget = tuple[PluginBase, Callable[..., Any], bool]
 
 
 class PluginManager:
@@ -31,6 +47,8 @@ class PluginManager:
         self.plugins_dir = Path(plugins_dir)
         self.plugins: dict[str, PluginBase] = {}
         self.discovered_plugins: dict[str, dict[str, Any]] = {}
+        self._by_priority: list[PluginBase] | None = None
+        self._hook_targets: dict[str, list[_HookTarget]] = {}
         self.db = db
         self.context_objects = context_objects or {}
 
@@ -85,7 +103,7 @@ class PluginManager:
             logger.info(f"Plugins directory not found: {self.plugins_dir}")
             return
         for plugin_dir in self._iter_plugin_dirs():
-            plugin_config = self._load_plugin_config(plugin_dir)
+            plugin_config = self._load_plugin_config(plugin_dir, skip_disabled=True)
             configured, enabled = self._discover_plugin_dir(plugin_dir, plugin_config)
             self._maybe_load_plugin_dir(
                 plugin_dir, plugin_config, configured=configured, enabled=enabled
@@ -97,13 +115,29 @@ class PluginManager:
         )
 
     @staticmethod
-    def _load_plugin_config(plugin_dir: Path) -> dict[str, Any]:
+    def _scan_disabled_config(raw: bytes) -> dict[str, Any] | None:
+        if len(_ENABLED_LINE_RE.findall(raw)) != 1 or not _DISABLED_LINE_RE.search(raw):
+            return None
+        config: dict[str, Any] = {"enabled": False}
+        if priority_keys := len(_PRIORITY_KEY_RE.findall(raw)):
+            match = _PRIORITY_LINE_RE.search(raw)
+            if priority_keys != 1 or match is None:
+                return None
+            config["priority"] = int(match.group(1))
+        return config
+
+    @staticmethod
+    def _load_plugin_config(
+        plugin_dir: Path, *, skip_disabled: bool = False
+    ) -> dict[str, Any]:
         config_file = plugin_dir / _PLUGIN_CONFIG_FILENAME
         if not config_file.exists():
             return {"enabled": False}
         try:
-            with open(config_file, encoding="utf-8") as f:
-                loaded = yaml.safe_load(f) or {}
+            raw = config_file.read_bytes()
+            if skip_disabled and (disabled := PluginManager._scan_disabled_config(raw)):
+                return disabled
+            loaded = yaml_load(raw) or {}
             if not isinstance(loaded, dict):
                 logger.error(
                     f"Error loading plugin config for {plugin_dir.name}: root node must be an object"
@@ -127,13 +161,14 @@ class PluginManager:
             if not (plugin_class := self._find_plugin_class(module, plugin_dir.name)):
                 return
             plugin_instance = self._create_plugin_instance(plugin_class, plugin_config)
-            self.plugins[plugin_dir.name] = plugin_instance
+            self._set_plugin(plugin_dir.name, plugin_instance)
         except Exception as e:
             logger.error(f"Failed to load plugin {plugin_dir.name}: {e}")
 
     @staticmethod
+    @functools.lru_cache(maxsize=128)
     def _camelize(name: str) -> str:
-        parts = [p for p in re.split(r"[^a-zA-Z0-9]+", name) if p]
+        parts = [p for p in _CAMELIZE_SPLIT_RE.split(name) if p]
         if not parts:
             return name.capitalize()
         return "".join(part[:1].upper() + part[1:] for part in parts)
@@ -151,14 +186,25 @@ class PluginManager:
         spec.loader.exec_module(module)
         return module
 
+    @staticmethod
+    def _iter_plugin_subclasses() -> list[type[PluginBase]]:
+        result: list[type[PluginBase]] = list(PluginBase.__subclasses__())
+        seen = set(result)
+        for cls in result:
+            for sub in cls.__subclasses__():
+                if sub not in seen:
+                    seen.add(sub)
+                    result.append(sub)
+        return result
+
     @staticmethod
     def _find_plugin_class(module, plugin_name):
+        namespace = vars(module)
+        module_name = module.__name__
         candidates = [
-            attr
-            for attr in (getattr(module, name) for name in dir(module))
-            if isinstance(attr, type)
-            and issubclass(attr, PluginBase)
-            and attr is not PluginBase
+            cls
+            for cls in PluginManager._iter_plugin_subclasses()
+            if cls.__module__ == module_name and namespace.get(cls.__name__) is cls
         ]
         if not candidates:
             logger.warning(f"No valid plugin class found in {plugin_name.capitalize()}")
@@ -197,67 +243,92 @@ class PluginManager:
         )
         return plugin_class(context)
 
-    async def _initialize_plugins(self) -> None:
-        for _, plugin in sorted(
-            self.plugins.items(), key=lambda x: x[1].priority, reverse=True
-        ):
-            if not plugin.enabled:
-                continue
-            try:
-                if not await plugin.initialize():
-                    logger.warning(f"Plugin {plugin.name} initialization failed")
-                    plugin.set_enabled(False)
-                    plugin._initialized = False
-                    continue
-                plugin._initialized = True
-            except asyncio.CancelledError:
-                raise
-            except Exception as e:
-                logger.exception(f"Error initializing plugin {plugin.name}: {e}")
+    @staticmethod
+    async def _initialize_plugin(plugin: PluginBase) -> None:
+        try:
+            if not await plugin.initialize():
+                logger.warning(f"Plugin {plugin.name} initialization failed")
                 plugin.set_enabled(False)
                 plugin._initialized = False
+                return
+            plugin._initialized = True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Error initializing plugin {plugin.name}: {e}")
+            plugin.set_enabled(False)
+            plugin._initialized = False
 
-    async def cleanup_plugins(self) -> None:
-        for plugin in self.plugins.values():
-            if plugin.enabled:
-                try:
-                    await plugin.cleanup()
-                except asyncio.CancelledError:
-                    raise
-                except Exception as e:
-                    logger.exception(f"Error cleaning up plugin {plugin.name}: {e}")
+    async def _initialize_plugins(self) -> None:
+        enabled = [p for p in self._plugins_by_priority() if p.enabled]
+        for _, tier in itertools.groupby(enabled, key=lambda p: p.priority):
+            await asyncio.gather(*(self._initialize_plugin(p) for p in tier))
 
     @staticmethod
-    async def _await_maybe(call: Any) -> Any:
-        if not inspect.isawaitable(call):
-            return call
-        return await call
-
-    def _iter_enabled_plugins(self):
-        yield from sorted(
-            (p for p in self.plugins.values() if p.enabled),
-            key=lambda x: x.priority,
-            reverse=True,
-        )
+    async def _cleanup_plugin(plugin: PluginBase) -> None:
+        try:
+            await plugin.cleanup()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Error cleaning up plugin {plugin.name}: {e}")
+
+    async def cleanup_plugins(self) -> None:
+        async with asyncio.TaskGroup() as tg:
+            for plugin in self.plugins.values():
+                if plugin.enabled:
+                    tg.create_task(self._cleanup_plugin(plugin))
+
+    def _invalidate_plugin_order(self) -> None:
+        self._by_priority = None
+        self._hook_targets = {}
+
+    def _set_plugin(self, key: str, plugin: PluginBase) -> None:
+        self.plugins[key] = plugin
+        self._invalidate_plugin_order()
+
+    def _remove_plugin(self, key: str) -> None:
+        if self.plugins.pop(key, None) is not None:
+            self._invalidate_plugin_order()
+
+    def _plugins_by_priority(self) -> list[PluginBase]:
+        if (order := self._by_priority) is None:
+            order = self._by_priority = sorted(
+                self.plugins.values(), key=lambda x: x.priority, reverse=True
+            )
+        return order
+
+    def _resolve_hook_targets(self, hook_name: str) -> list[_HookTarget]:
+        targets = self._hook_targets.get(hook_name)
+        if targets is None:
+            targets = [
+                (plugin, method, inspect.iscoroutinefunction(method))
+                for plugin in self._plugins_by_priority()
+                if (method := getattr(plugin, hook_name, None)) is not None
+            ]
+            self._hook_targets[hook_name] = targets
+        return targets
 
     async def _call_single_plugin_hook(
-        self, plugin: PluginBase, hook_name: str, *, args, kwargs
+        self,
+        plugin: PluginBase,
+        hook_name: str,
+        method: Callable[..., Any],
+        is_async: bool,
+        *,
+        timeout: float | None,
+        args,
+        kwargs,
     ) -> Any | None:
-        method = getattr(plugin, hook_name, None)
-        if method is None:
-            return None
-        timeout = (
-            _PLUGIN_HOOK_TIMEOUT_SECONDS
-            if hook_name in {"on_message", "on_mention"}
-            else None
-        )
         try:
             call = method(*args, **kwargs)
-            if timeout is None:
-                result = await self._await_maybe(call)
+            if not is_async and not inspect.isawaitable(call):
+                result = call
+            elif timeout is None:
+                result = await call
             else:
                 async with asyncio.timeout(timeout):
-                    result = await self._await_maybe(call)
+                    result = await call
         except asyncio.CancelledError:
             raise
         except TimeoutError:
@@ -281,10 +352,19 @@ class PluginManager:
 
     async def call_plugin_hook(self, hook_name: str, *args, **kwargs) -> list[Any]:
         results: list[Any] = []
-        stop_on_handled = hook_name in {"on_message", "on_mention"}
-        for plugin in self._iter_enabled_plugins():
+        stop_on_handled = hook_name in _HANDLING_HOOKS
+        timeout = _PLUGIN_HOOK_TIMEOUT_SECONDS if stop_on_handled else None
+        for plugin, method, is_async in self._resolve_hook_targets(hook_name):
+            if not plugin.enabled:
+                continue
             result = await self._call_single_plugin_hook(
-                plugin, hook_name, args=args, kwargs=kwargs
+                plugin,
+                hook_name,
+                method,
+                is_async,
+                timeout=timeout,
+                args=args,
+                kwargs=kwargs,
             )
             if result is None:
                 continue
@@ -294,19 +374,13 @@ class PluginManager:
         return results
 
     def get_plugin_info(self) -> list[dict[str, Any]]:
-        loaded = {name: plugin.get_info() for name, plugin in self.plugins.items()}
-        configured = {
-            name: info
-            for name, info in self.discovered_plugins.items()
-            if info.get("configured") and name not in loaded
+        info = {
+            name: data
+            for name, data in self.discovered_plugins.items()
+            if data.get("configured")
         }
-        result: list[dict[str, Any]] = []
-        for name in sorted(loaded.keys() | configured.keys()):
-            if name in loaded:
-                result.append(loaded[name])
-            else:
-                result.append(configured[name])
-        return result
+        info.update((name, plugin.get_info()) for name, plugin in self.plugins.items())
+        return [info[name] for name in sorted(info)]
 
     def get_plugin(self, name: str) -> PluginBase | None:
         return self.plugins.get(name)
@@ -319,6 +393,10 @@ class PluginManager:
     def _find_plugin_dir(self, name: str) -> Path | None:
         if not self.plugins_dir.exists():
             return None
+        if name in self.discovered_plugins:
+            candidate = self.plugins_dir / name
+            if candidate.is_dir():
+                return candidate
         lowered = name.lower()
         for plugin_dir in self.plugins_dir.iterdir():
             if (
@@ -390,7 +468,7 @@ class PluginManager:
         await self._cleanup_plugin_instance(plugin)
         if plugin:
             plugin.set_enabled(False)
-        self.plugins.pop(key, None)
+        self._remove_plugin(key)
         self._unload_plugin_module(key)
         if key in self.discovered_plugins:
             self.discovered_plugins[key]["enabled"] = False
@@ -401,12 +479,12 @@ class PluginManager:
             return False
         key = plugin_dir.name
         await self._cleanup_plugin_instance(self._find_plugin_by_name(key))
-        self.plugins.pop(key, None)
+        self._remove_plugin(key)
         self._unload_plugin_module(key)
         if not (plugin := self._load_plugin_from_dir(plugin_dir)):
             return False
         if not plugin.enabled:
-            self.plugins.pop(key, None)
+            self._remove_plugin(key)
             self._unload_plugin_module(key)
             return True
         return await self._start_plugin_instance(plugin)
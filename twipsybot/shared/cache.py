@@ -0,0 +1,105 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator, MutableMapping
+from typing import Any, TypeVar
+
+__all__ = ("RotatingKeySet", "TTLLRUCache")
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLLRUCache(MutableMapping[K, V]):
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def _expire(self, now: float) -> None:
+        data = self._data
+        while data:
+            key, (_, expires_at) = next(iter(data.items()))
+            if expires_at > now:
+                return
+            del data[key]
+
+    def __getitem__(self, key: K) -> V:
+        value, expires_at = self._data[key]
+        now = time.monotonic()
+        if expires_at <= now:
+            del self._data[key]
+            raise KeyError(key)
+        self._data[key] = (value, now + self.ttl)
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        now = time.monotonic()
+        self._expire(now)
+        data = self._data
+        data[key] = (value, now + self.ttl)
+        data.move_to_end(key)
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def __delitem__(self, key: K) -> None:
+        del self._data[key]
+
+    def __contains__(self, key: Any) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def __iter__(self) -> Iterator[K]:
+        self._expire(time.monotonic())
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        self._expire(time.monotonic())
+        return len(self._data)
+
+    def get(self, key: K, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class RotatingKeySet:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._generation_size = max(1, maxsize // 2)
+        self._generation_ttl = ttl / 2
+        self._active: set[Hashable] = set()
+        self._previous: set[Hashable] = set()
+        self._rotated_at = time.monotonic()
+
+    def _maybe_rotate(self) -> None:
+        now = time.monotonic()
+        if now - self._rotated_at >= self._generation_ttl:
+            if now - self._rotated_at >= self.ttl:
+                self._active = set()
+            self._previous, self._active = self._active, set()
+            self._rotated_at = now
+        elif len(self._active) >= self._generation_size:
+            self._previous, self._active = self._active, set()
+            self._rotated_at = now
+
+    def __contains__(self, key: Hashable) -> bool:
+        self._maybe_rotate()
+        return key in self._active or key in self._previous
+
+    def add(self, key: Hashable) -> None:
+        self._maybe_rotate()
+        self._active.add(key)
+
+    def __len__(self) -> int:
+        return len(self._active) + len(self._previous)
+
+    def clear(self) -> None:
+        self._active.clear()
+        self._previous.clear()
+        self._rotated_at = time.monotonic()
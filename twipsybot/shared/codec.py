@@ -0,0 +1,40 @@
+import json
+from typing import Any
+
+import yaml
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = ("json_dumps", "json_dumps_pretty", "json_loads", "yaml_load")
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def yaml_load(data: str | bytes) -> Any:
+    return yaml.load(data, Loader=_YAML_LOADER)
+
+
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def json_dumps_pretty(obj: Any) -> str:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+else:
+
+    def json_loads(data: str | bytes) -> Any:
+        return json.loads(data)
+
+    def json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def json_dumps_pretty(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
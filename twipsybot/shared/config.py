@@ -1,10 +1,13 @@
+import functools
 import os
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from pydantic import BaseModel, Field, ValidationError, field_validator
 
+from .codec import yaml_load
 from .config_keys import ConfigKeys
 from .exceptions import ConfigurationError
 
@@ -46,19 +49,30 @@ _ENV_TO_KEY = {
     "BOT_TIMELINE_ANTENNA_IDS": ConfigKeys.BOT_TIMELINE_ANTENNA_IDS,
     "DB_PATH": ConfigKeys.DB_PATH,
     "DB_CLEAR": ConfigKeys.DB_CLEAR,
+    "DB_MMAP_MB": ConfigKeys.DB_MMAP_MB,
     "LOG_PATH": ConfigKeys.LOG_PATH,
     "LOG_LEVEL": ConfigKeys.LOG_LEVEL,
     "LOG_DUMP_EVENTS": ConfigKeys.LOG_DUMP_EVENTS,
 }
 
+_TIMELINE_GLOBAL_FIELD = "bot.timeline.global_"
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
-def _project_root() -> Path:
-    return Path(__file__).resolve().parents[2]
 
+@functools.lru_cache(maxsize=256)
+def _split_key(dotted: str) -> tuple[str, ...]:
+    return tuple(dotted.split("."))
 
-def _set_dotted(config: dict[str, Any], dotted: str, value: Any) -> None:
+
+_ENV_TO_PARTS = {env: _split_key(key) for env, key in _ENV_TO_KEY.items()}
+_PROMPT_KEY_PARTS = (
+    _split_key(ConfigKeys.BOT_SYSTEM_PROMPT),
+    _split_key(ConfigKeys.BOT_AUTO_POST_PROMPT),
+)
+
+
+def _set_dotted(config: dict[str, Any], parts: tuple[str, ...], value: Any) -> None:
     cur: dict[str, Any] = config
-    parts = dotted.split(".")
     for key in parts[:-1]:
         nxt = cur.get(key)
         if not isinstance(nxt, dict):
@@ -68,15 +82,32 @@ def _set_dotted(config: dict[str, Any], dotted: str, value: Any) -> None:
     cur[parts[-1]] = value
 
 
-def _get_dotted(config: dict[str, Any], dotted: str) -> Any:
+def _get_dotted(config: dict[str, Any], parts: tuple[str, ...]) -> Any:
     cur: Any = config
-    for key in dotted.split("."):
-        if not isinstance(cur, dict):
-            return None
-        cur = cur.get(key)
+    try:
+        for key in parts:
+            cur = cur[key]
+    except (KeyError, TypeError):
+        return None
     return cur
 
 
+def _flatten(
+    node: BaseModel | dict[str, Any], prefix: str, out: dict[str, Any]
+) -> dict[str, Any]:
+    items = node.__dict__ if isinstance(node, BaseModel) else node
+    section: dict[str, Any] = {}
+    for key, value in items.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, (BaseModel, dict)):
+            value = _flatten(value, f"{path}.", out)
+        elif isinstance(value, list):
+            value = list(value)
+        out[path] = value
+        section[key] = value
+    return section
+
+
 def _maybe_load_text_file(
     value: str,
     *,
@@ -91,9 +122,12 @@ def _maybe_load_text_file(
     if not path.parts or path.parts[0] != "prompts":
         return value
     resolved = (project_root / path).resolve()
-    if not resolved.is_file() or not resolved.is_relative_to(project_root / "prompts"):
+    if not resolved.is_relative_to(project_root / "prompts"):
+        return value
+    try:
+        return resolved.read_text(encoding="utf-8").strip()
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
         return value
-    return resolved.read_text(encoding="utf-8").strip()
 
 
 class MisskeyConfig(BaseModel):
@@ -105,31 +139,14 @@ class OpenAIConfig(BaseModel):
     api_key: str
     model: str = "deepseek-chat"
     api_base: str = "https://api.deepseek.com/v1"
-    api_mode: str = "auto"
-    max_tokens: int = 1000
-    temperature: float = 0.8
-
-    @field_validator("api_mode")
-    @classmethod
-    def _validate_api_mode(cls, v: str) -> str:
-        s = v.strip().lower()
-        if s not in {"auto", "chat", "responses"}:
-            raise ValueError("OpenAI API mode must be auto/chat/responses")
-        return s
+    api_mode: Literal["auto", "chat", "responses"] = "auto"
+    max_tokens: int = Field(default=1000, gt=0)
+    temperature: float = Field(default=0.8, ge=0, le=2)
 
-    @field_validator("max_tokens")
+    @field_validator("api_mode", mode="before")
     @classmethod
-    def _validate_max_tokens(cls, v: int) -> int:
-        if v <= 0:
-            raise ValueError("max tokens must be > 0")
-        return v
-
-    @field_validator("temperature")
-    @classmethod
-    def _validate_temperature(cls, v: float) -> float:
-        if not (0 <= float(v) <= 2):
-            raise ValueError("temperature must be between 0 and 2")
-        return float(v)
+    def _normalize_api_mode(cls, v: Any) -> Any:
+        return v.strip().lower() if isinstance(v, str) else v
 
 
 class TimelineConfig(BaseModel):
@@ -150,61 +167,30 @@ class TimelineConfig(BaseModel):
 
 class AutoPostConfig(BaseModel):
     enabled: bool = True
-    interval_minutes: int = 180
-    max_posts_per_day: int = 8
-    visibility: str = "public"
+    interval_minutes: int = Field(default=180, gt=0)
+    max_posts_per_day: int = Field(default=8, ge=0)
+    visibility: Literal["public", "home", "followers"] = "public"
     local_only: bool = False
     prompt: str = ""
 
-    @field_validator("interval_minutes")
-    @classmethod
-    def _validate_interval_minutes(cls, v: int) -> int:
-        if v <= 0:
-            raise ValueError("auto-post interval must be > 0")
-        return v
-
-    @field_validator("max_posts_per_day")
+    @field_validator("visibility", mode="before")
     @classmethod
-    def _validate_max_posts_per_day(cls, v: int) -> int:
-        if v < 0:
-            raise ValueError("max auto-posts per day must be >= 0")
-        return v
-
-    @field_validator("visibility")
-    @classmethod
-    def _validate_visibility(cls, v: str) -> str:
-        s = v.strip()
-        if s not in {"public", "home", "followers"}:
-            raise ValueError("post visibility must be public/home/followers")
-        return s
+    def _normalize_visibility(cls, v: Any) -> Any:
+        return v.strip() if isinstance(v, str) else v
 
 
 class ResponseConfig(BaseModel):
     mention: bool = True
     chat: bool = True
-    chat_memory: int = 10
+    chat_memory: int = Field(default=10, ge=0)
     rate_limit: int | str = -1
     rate_limit_reply: str = "我需要休息一下..."
-    max_turns: int = -1
+    max_turns: int = Field(default=-1, ge=-1)
     max_turns_reply: str = "我要回家了..."
     max_turns_release: int | str = -1
     whitelist: list[str] | str = []
     blacklist: list[str] | str = []
 
-    @field_validator("chat_memory")
-    @classmethod
-    def _validate_chat_memory(cls, v: int) -> int:
-        if v < 0:
-            raise ValueError("chat context memory length must be >= 0")
-        return v
-
-    @field_validator("max_turns")
-    @classmethod
-    def _validate_max_turns(cls, v: int) -> int:
-        if v < -1:
-            raise ValueError("response max turns must be >= -1")
-        return v
-
 
 class BotConfig(BaseModel):
     system_prompt: str = ""
@@ -216,6 +202,7 @@ class BotConfig(BaseModel):
 class DBConfig(BaseModel):
     path: str = "data/twipsybot.db"
     clear: int | str = 30
+    mmap_mb: int = Field(default=256, ge=0)
 
     @field_validator("clear")
     @classmethod
@@ -245,16 +232,31 @@ class Config:
     def __init__(self, config_path: str | None = None):
         self.config_path = config_path or os.environ.get("CONFIG_PATH", "config.yaml")
         self._model: AppConfig | None = None
-        self.data: dict[str, Any] = {}
+        self._source: dict[str, Any] | None = None
+        self._data: dict[str, Any] = {}
+        self._flat: dict[str, Any] = {}
+        self.version = 0
+        self._listeners: list[Callable[[], None]] = []
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        self._listeners.append(listener)
+
+    def _bump_version(self) -> None:
+        self.version += 1
+        for listener in self._listeners:
+            listener()
 
     def load(self) -> None:
         config_path = Path(self.config_path)
         merged = self._load_yaml_config(config_path)
         self._apply_env_overrides(merged)
         self._expand_prompt_files(merged, config_path)
-        self._model = self._validate_model(merged)
-        self.data = self._model.model_dump()
+        if self._model is None or merged != self._source:
+            self._model = self._validate_model(merged)
+            self._source = merged
+        self._reindex(self._model)
         self._ensure_paths()
+        self._bump_version()
 
     @staticmethod
     def _load_yaml_config(config_path: Path) -> dict[str, Any]:
@@ -269,7 +271,7 @@ class Config:
         except OSError as e:
             raise ConfigurationError(f"Config file read error: {e}") from e
         try:
-            loaded = yaml.safe_load(raw) or {}
+            loaded = yaml_load(raw) or {}
         except yaml.YAMLError as e:
             raise ConfigurationError(f"YAML config parse error: {e}") from e
         if not isinstance(loaded, dict):
@@ -278,21 +280,20 @@ class Config:
 
     @staticmethod
     def _apply_env_overrides(config: dict[str, Any]) -> None:
-        for env_name, key in _ENV_TO_KEY.items():
-            if (env_value := os.environ.get(env_name)) is not None:
-                _set_dotted(config, key, env_value)
+        for env_name, env_value in os.environ.items():
+            if (parts := _ENV_TO_PARTS.get(env_name)) is not None:
+                _set_dotted(config, parts, env_value)
 
     @staticmethod
     def _expand_prompt_files(config: dict[str, Any], config_path: Path) -> None:
-        project_root = _project_root()
-        for key in (ConfigKeys.BOT_SYSTEM_PROMPT, ConfigKeys.BOT_AUTO_POST_PROMPT):
-            value = _get_dotted(config, key)
+        for parts in _PROMPT_KEY_PARTS:
+            value = _get_dotted(config, parts)
             if not isinstance(value, str):
                 continue
             _set_dotted(
                 config,
-                key,
-                _maybe_load_text_file(value, project_root=project_root),
+                parts,
+                _maybe_load_text_file(value, project_root=_PROJECT_ROOT),
             )
 
     @staticmethod
@@ -300,7 +301,7 @@ class Config:
         try:
             return AppConfig.model_validate(config)
         except ValidationError as e:
-            raise ConfigurationError(str(e)) from e
+            raise ConfigurationError(e) from e
 
     def _ensure_paths(self) -> None:
         for key, desc in (
@@ -315,19 +316,33 @@ class Config:
             except OSError as e:
                 raise ConfigurationError(f"failed to create {desc}: {path}") from e
 
+    @property
+    def data(self) -> dict[str, Any]:
+        return self._data
+
+    @data.setter
+    def data(self, value: dict[str, Any]) -> None:
+        self._reindex(value)
+
+    def _reindex(self, source: BaseModel | dict[str, Any]) -> None:
+        flat: dict[str, Any] = {}
+        self._data = _flatten(source, "", flat)
+        flat[ConfigKeys.BOT_TIMELINE_GLOBAL] = flat.get(_TIMELINE_GLOBAL_FIELD)
+        self._flat = flat
+
     def get(self, key: str, default: Any = _MISSING) -> Any:
-        if self._model is None:
-            if default is not _MISSING:
-                return default
-            return None
-        if key == ConfigKeys.BOT_TIMELINE_GLOBAL:
-            value = _get_dotted(self.data, "bot.timeline.global_")
-        else:
-            value = _get_dotted(self.data, key)
+        value = self._flat.get(key)
         if value is None and default is not _MISSING:
             return default
         return value
 
+    def set(self, key: str, value: Any) -> None:
+        if key == ConfigKeys.BOT_TIMELINE_GLOBAL:
+            key = _TIMELINE_GLOBAL_FIELD
+        _set_dotted(self._data, _split_key(key), value)
+        self._reindex(self._data)
+        self._bump_version()
+
     def get_required(self, key: str, desc: str | None = None) -> Any:
         value = self.get(key)
         if value is None:
@@ -32,6 +32,7 @@ class ConfigKeys:
     BOT_TIMELINE_ANTENNA_IDS = "bot.timeline.antenna_ids"
     DB_PATH = "db.path"
     DB_CLEAR = "db.clear"
+    DB_MMAP_MB = "db.mmap_mb"
     LOG_PATH = "log.path"
     LOG_LEVEL = "log.level"
     LOG_DUMP_EVENTS = "log.dump_events"
@@ -11,22 +11,35 @@ HTTP_GATEWAY_TIMEOUT = 504
 
 API_TIMEOUT = 60
 API_MAX_RETRIES = 3
-REQUEST_TIMEOUT = 120
 
 OPENAI_MAX_CONCURRENCY = 4
 MISSKEY_MAX_CONCURRENCY = 20
 
+DB_POOL_WARMUP = 4
+DB_READERS = 2
+
 STREAM_WORKERS = 8
+STREAM_HANDLER_CONCURRENCY = 4
 STREAM_QUEUE_MAX = 1000
-STREAM_QUEUE_PUT_TIMEOUT = 1.0
+STREAM_READ_FLUSH_DELAY = 0.05
+STREAM_HEARTBEAT = 30.0
+STREAM_RECONNECT_BASE_DELAY = 1.0
+STREAM_RECONNECT_MAX_DELAY = 30.0
+CHAT_USER_CACHE_MAX = 512
 
 STREAM_DEDUP_CACHE_MAX = 2000
 STREAM_DEDUP_CACHE_TTL = 600
 
+ANTENNA_CACHE_TTL = 60
+
 RESPONSE_LIMIT_CACHE_MAX = 2000
 RESPONSE_LIMIT_CACHE_TTL = 86400
+RESPONSE_LIMIT_FLUSH_INTERVAL = 5.0
 
 CHAT_CACHE_MAX_USERS = 1000
 CHAT_CACHE_TTL = 3600
+CHAT_ROOM_PREFIX = "room:"
+MENTION_PARSE_CACHE_MAX = 256
+STRUCTURED_FORMAT_CACHE_MAX = 128
 USER_LOCK_CACHE_MAX = 2000
 USER_LOCK_TTL = 3600
@@ -1,10 +1,9 @@
-import json
+import functools
 import os
 import platform
 import re
 from typing import Any
 
-import psutil
 from loguru import logger
 from tenacity import (
     retry,
@@ -13,6 +12,8 @@ from tenacity import (
     wait_random_exponential,
 )
 
+from .codec import json_dumps_pretty
+
 __all__ = (
     "extract_user_handle",
     "extract_user_id",
@@ -31,15 +32,20 @@ __all__ = (
     "retry_async",
 )
 
-_MISSKEY_I_PARAM_RE = re.compile(r"([?&]i=)[^&#\s]+")
-_MISSKEY_I_JSON_RE = re.compile(r'("i"\s*:\s*")[^"]+(")')
+_COMMA_TO_SPACE = str.maketrans({",": " "})
+_MISSKEY_TOKEN_RE = re.compile(r'([?&]i=)[^&#\s]+|("i"\s*:\s*")[^"]+"')
+
+
+def _redact_token_match(m: re.Match[str]) -> str:
+    if (param := m.group(1)) is not None:
+        return f"{param}***"
+    return f'{m.group(2)}***"'
 
 
 def redact_misskey_access_token(text: str) -> str:
-    if not text:
+    if not text or ("i=" not in text and '"i"' not in text):
         return text
-    text = _MISSKEY_I_PARAM_RE.sub(r"\1***", text)
-    return _MISSKEY_I_JSON_RE.sub(r"\1***\2", text)
+    return _MISSKEY_TOKEN_RE.sub(_redact_token_match, text)
 
 
 def retry_async(max_retries=3, retryable_exceptions=None):
@@ -55,7 +61,10 @@ def retry_async(max_retries=3, retryable_exceptions=None):
     return retry(**kwargs)
 
 
-def get_system_info() -> dict[str, Any]:
+@functools.cache
+def _system_info() -> dict[str, Any]:
+    import psutil
+
     return {
         "platform": platform.platform(),
         "python_version": platform.python_version(),
@@ -65,8 +74,19 @@ def get_system_info() -> dict[str, Any]:
     }
 
 
+def get_system_info() -> dict[str, Any]:
+    return dict(_system_info())
+
+
+@functools.cache
+def _current_process():
+    import psutil
+
+    return psutil.Process()
+
+
 def get_memory_usage() -> dict[str, Any]:
-    process = psutil.Process()
+    process = _current_process()
     memory_info = process.memory_info()
     mb_factor = 1024 * 1024
     return {
@@ -80,21 +100,15 @@ def normalize_tokens(value: Any, *, lower: bool = False) -> list[str]:
     if value is None or isinstance(value, bool):
         return []
     if isinstance(value, str):
-        tokens = [t.strip() for t in value.replace(",", " ").split() if t.strip()]
+        tokens = value.translate(_COMMA_TO_SPACE).split()
     elif isinstance(value, list):
         tokens = [str(v).strip() for v in value if v is not None and str(v).strip()]
     else:
         s = str(value).strip()
         tokens = [s] if s else []
-    seen: set[str] = set()
-    out: list[str] = []
-    for t in tokens:
-        k = t.lower() if lower else t
-        if k in seen:
-            continue
-        seen.add(k)
-        out.append(k if lower else t)
-    return out
+    if lower:
+        return list(dict.fromkeys(t.lower() for t in tokens))
+    return list(dict.fromkeys(tokens))
 
 
 def extract_first_text(data: Any, *keys: str) -> str:
@@ -108,7 +122,13 @@ def extract_first_text(data: Any, *keys: str) -> str:
 
 
 def extract_chat_text(data: Any) -> str:
-    return extract_first_text(data, "text", "content", "body")
+    if not isinstance(data, dict):
+        return ""
+    for key in ("text", "content", "body"):
+        value = data.get(key)
+        if isinstance(value, str) and (s := value.strip()):
+            return s
+    return ""
 
 
 def extract_note_text(
@@ -142,7 +162,7 @@ def maybe_log_event_dump(enabled: bool, *, kind: str, payload: Any) -> None:
     logger.opt(lazy=True).debug(
         "{} data: {}",
         lambda: kind,
-        lambda: json.dumps(payload, ensure_ascii=False, indent=2),
+        lambda: json_dumps_pretty(payload),
     )
 
 
@@ -163,23 +183,25 @@ def resolve_history_limit(config_value: int | None, limit: int | None) -> int:
     return 0
 
 
-def extract_user_id(message: dict[str, Any]) -> str | None:
+def _resolve_user(message: dict[str, Any]) -> dict[str, Any] | None:
     user_info = message.get("fromUser") or message.get("user")
-    if isinstance(user_info, dict):
+    return user_info if isinstance(user_info, dict) else None
+
+
+def extract_user_id(message: dict[str, Any]) -> str | None:
+    if (user_info := _resolve_user(message)) is not None:
         return user_info.get("id")
     return message.get("userId") or message.get("fromUserId")
 
 
 def extract_username(message: dict[str, Any]) -> str:
-    user_info = message.get("fromUser") or message.get("user", {})
-    if isinstance(user_info, dict):
+    if (user_info := _resolve_user(message)) is not None:
         return user_info.get("username", "unknown")
     return "unknown"
 
 
 def extract_user_handle(message: dict[str, Any]) -> str | None:
-    user_info = message.get("fromUser") or message.get("user")
-    if not isinstance(user_info, dict):
+    if (user_info := _resolve_user(message)) is None:
         return None
     username = user_info.get("username")
     if not isinstance(username, str) or not (u := username.strip()):